@@ -1,14 +1,15 @@
 #!/bin/env python3
 
 from contextlib import asynccontextmanager
+import os
 import time
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
+from fastapi.staticfiles import StaticFiles
 
-from src.api.post import post_router, tag_router
+from src.api.post import post_router, tag_router, rating_router
 from src.models.users import Role, User
 from src.api.auth.auth import auth_router
 from src.api.general.check import general_check_router
@@ -18,10 +19,16 @@ from src.api.user import user_router, admin_moderator_work_with_user_router
 from src.api.qrcode import qr_code_router
 from src.db.redis import redis_manager
 from src.repository.user import create_admin
+from src.services.image import cloudinary_service
+from src.services.password import password_service
+from src.services.transform import transform_service
 from src.db.database import sessionmanager
+from src.db.query_stats import track_queries
+from src.core.metrics import http_requests_in_flight, http_request_duration_seconds, http_requests_total
 from src.core import log
+from src.core.logger.logger import flush_logs
 from src.core import base_config
-from src.db import events
+from src.core import config
 
 
 @asynccontextmanager
@@ -31,14 +38,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await redis_manager.connect()
     async with sessionmanager.session() as db:
         await create_admin(db)
-    # Отримуємо сесію Redis для FastAPILimiter
-    async with redis_manager.session() as redis:
-        await FastAPILimiter.init(redis)
 
     yield
     log.info("App shutting down...")
     await redis_manager.close()
-    await FastAPILimiter.close()
+    await cloudinary_service.close()
+    if transform_service is not cloudinary_service:
+        await transform_service.close()
+    password_service.shutdown()
+    await sessionmanager.close()
+    # Дописуємо буфер логів до завершення процесу
+    log.info("App shut down")
+    flush_logs()
 
 
 app = FastAPI(
@@ -64,10 +75,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def instrumentation_middleware(request: Request, call_next):
+    # Латентність за маршрутом, запити в обробці, статуси; у debug-режимі — SQL-лічильники в заголовках
+    http_requests_in_flight.inc()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        with track_queries() as stats:
+            response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        http_requests_in_flight.dec()
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        http_request_duration_seconds.observe(time.perf_counter() - started, method=request.method, route=route_path)
+        http_requests_total.inc(method=request.method, route=route_path, status=status_code)
+    if base_config.app_config.DEBUG:
+        response.headers["X-DB-Statements"] = str(stats.statements)
+        response.headers["X-DB-Rows"] = str(stats.rows)
+        response.headers["X-DB-Time-Ms"] = f"{stats.db_time * 1000:.2f}"
+    return response
+
+
+if config.transform_config.IMAGE_TRANSFORM_BACKEND == "local":
+    # Похідні локального бекенду трансформацій
+    os.makedirs(base_config.MEDIA_DIR, exist_ok=True)
+    app.mount("/media", StaticFiles(directory=base_config.MEDIA_DIR), name="media")
+
 app.include_router(auth_router, prefix="/api")
 app.include_router(post_router, prefix="/api")
 app.include_router(general_check_router, prefix="/api")
 app.include_router(tag_router, prefix="/api")
+app.include_router(rating_router, prefix="/api")
 app.include_router(images_router, prefix="/api")
 app.include_router(comments_router, prefix="/api")
 app.include_router(user_router, prefix="/api")
@@ -0,0 +1,77 @@
+"""Add posts full-text search
+
+Revision ID: 0b5d7e2f9a14
+Revises: f3a8b0d61c25
+Create Date: 2026-10-18 14:31:50.771203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b5d7e2f9a14'
+down_revision: Union[str, None] = 'f3a8b0d61c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}description, '')), 'B')"
+)
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GENERATED ... STORED переписав би всю таблицю під ACCESS EXCLUSIVE.
+    # Nullable-колонка без default змінює лише каталог, значення підтримує тригер
+    op.add_column('posts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION posts_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row='NEW.')};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_search_vector
+        BEFORE INSERT OR UPDATE OF title, description ON posts
+        FOR EACH ROW EXECUTE FUNCTION posts_search_vector_refresh()
+    """)
+    with op.get_context().autocommit_block():
+        # Існуючі рядки заповнюємо партіями по первинному ключу: кожна партія — окрема коротка транзакція
+        conn = op.get_bind()
+        last_id = None
+        while True:
+            last_id = conn.execute(sa.text(f"""
+                WITH batch AS (
+                    SELECT id FROM posts
+                    WHERE CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid)
+                    ORDER BY id LIMIT :batch_size
+                ), updated AS (
+                    UPDATE posts SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='posts.')}
+                    FROM batch WHERE posts.id = batch.id
+                    RETURNING posts.id
+                )
+                SELECT max(id::text) FROM updated
+            """), {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}).scalar()
+            if last_id is None:
+                break
+        op.create_index(
+            'ix_posts_search_vector', 'posts', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_search_vector', table_name='posts', postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS posts_search_vector ON posts")
+    op.execute("DROP FUNCTION IF EXISTS posts_search_vector_refresh()")
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,92 @@
+"""Add transformed images transformation key
+
+Revision ID: 8e2c4b7a1d90
+Revises: 4d1f6a8c3e57
+Create Date: 2026-10-18 15:41:12.208734
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.services.transform import transformation_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2c4b7a1d90'
+down_revision: Union[str, None] = '4d1f6a8c3e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def legacy_key(post_id, url: str) -> str | None:
+    # Старі записи — URL Cloudinary, де параметри закодовані в сегменті трансформації (c_fill,h_100,w_200)
+    _, found, path = url.partition("/image/upload/")
+    if not found:
+        return None
+    options = dict(part.split("_", 1) for part in path.split("/", 1)[0].split(",") if "_" in part)
+    try:
+        if options.keys() == {"c", "h", "w"}:
+            return transformation_key(post_id, "resize", {"width": int(options["w"]), "height": int(options["h"]), "crop": options["c"]})
+        if options.keys() == {"e"}:
+            effect, _, value = options["e"].rpartition(":")
+            return transformation_key(post_id, "apply_filter", {"effect": effect, "value": int(value)})
+        if options.keys() == {"f", "q"}:
+            return transformation_key(post_id, "reduce_size", {"quality": options["q"], "format": options["f"]})
+    except ValueError:
+        return None
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transformed_images', sa.Column('transformation_key', sa.String(length=64), nullable=True))
+    # Дублікати з гонок check-then-insert: залишаємо найстаріший запис для кожного URL
+    op.execute("""
+        DELETE FROM transformed_images a USING transformed_images b
+        WHERE a.url = b.url AND (a.created_at, a.id) > (b.created_at, b.id)
+    """)
+    # Ключ рахується тією ж функцією, що й у сервісі, тож повторний запит знаходить старий запис.
+    # Записи, параметри яких не відновити (похідні локального бекенду), видаляються: їх перерахує наступний запит
+    conn = op.get_bind()
+    seen = set()
+    after = uuid.UUID(int=0)
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, post_id, url FROM transformed_images WHERE id > :after ORDER BY id LIMIT :limit"
+        ), {"after": after, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+        after = rows[-1].id
+        updates, stale = [], []
+        for row in rows:
+            key = legacy_key(row.post_id, row.url)
+            if key is None or key in seen:
+                stale.append(row.id)
+            else:
+                seen.add(key)
+                updates.append({"id": row.id, "key": key})
+        if updates:
+            conn.execute(sa.text("UPDATE transformed_images SET transformation_key = :key WHERE id = :id"), updates)
+        if stale:
+            conn.execute(sa.text("DELETE FROM transformed_images WHERE id = ANY(:ids)"), {"ids": stale})
+    op.alter_column('transformed_images', 'transformation_key', nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_transformed_images_transformation_key', 'transformed_images', ['transformation_key'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_transformed_images_transformation_key', table_name='transformed_images',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('transformed_images', 'transformation_key')
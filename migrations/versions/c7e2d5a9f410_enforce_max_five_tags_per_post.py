@@ -0,0 +1,68 @@
+"""Enforce max five tags per post
+
+Revision ID: c7e2d5a9f410
+Revises: a3c9e4f1b2d7
+Create Date: 2026-10-18 11:40:07.218653
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2d5a9f410'
+down_revision: Union[str, None] = 'a3c9e4f1b2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('tag_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.execute("""
+        UPDATE posts SET tag_count = counts.total
+        FROM (SELECT post_id, count(*) AS total FROM post_tags GROUP BY post_id) AS counts
+        WHERE posts.id = counts.post_id
+    """)
+    # Пости, що вже мають понад 5 тегів, не пройдуть CHECK: просимо прибрати зайві теги вручну
+    over_limit = op.get_bind().execute(sa.text(
+        "SELECT id, tag_count, count(*) OVER () AS total FROM posts WHERE tag_count > 5 "
+        "ORDER BY tag_count DESC, id LIMIT 10"
+    )).all()
+    if over_limit:
+        examples = ", ".join(f"{row.id} ({row.tag_count} tags)" for row in over_limit)
+        raise RuntimeError(
+            f"{over_limit[0].total} posts have more than 5 tags, e.g. {examples}. "
+            "Delete the extra post_tags rows for these posts and rerun the migration."
+        )
+    op.create_check_constraint('ck_posts_tag_count_max_five', 'posts', 'tag_count <= 5')
+    # UPDATE рядка поста блокує його, тому паралельні вставки тегів для одного поста серіалізуються
+    op.execute("""
+        CREATE OR REPLACE FUNCTION post_tags_maintain_tag_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE posts SET tag_count = tag_count - 1 WHERE id = OLD.post_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE posts SET tag_count = tag_count + 1 WHERE id = NEW.post_id;
+                RETURN NEW;
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER post_tags_tag_count
+        AFTER INSERT OR DELETE OR UPDATE OF post_id ON post_tags
+        FOR EACH ROW EXECUTE FUNCTION post_tags_maintain_tag_count()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS post_tags_tag_count ON post_tags")
+    op.execute("DROP FUNCTION IF EXISTS post_tags_maintain_tag_count()")
+    op.drop_constraint('ck_posts_tag_count_max_five', 'posts', type_='check')
+    op.drop_column('posts', 'tag_count')
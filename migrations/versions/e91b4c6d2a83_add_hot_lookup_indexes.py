@@ -0,0 +1,47 @@
+"""Add hot lookup indexes
+
+Revision ID: e91b4c6d2a83
+Revises: c7e2d5a9f410
+Create Date: 2026-10-18 12:25:44.630918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b4c6d2a83'
+down_revision: Union[str, None] = 'c7e2d5a9f410'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_posts_user_id', 'posts', ['user_id'], False),
+    ('uq_post_tags_post_id_tag_id', 'post_tags', ['post_id', 'tag_id'], True),
+    ('ix_post_tags_tag_id', 'post_tags', ['tag_id'], False),
+    ('ix_comments_post_id_created_at_id', 'comments', ['post_id', 'created_at', 'id'], False),
+    ('ix_transformed_images_url', 'transformed_images', ['url'], False),
+    ('ix_transformed_images_user_id', 'transformed_images', ['user_id'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Прибираємо дублікати тегів поста перед унікальним індексом
+    op.execute("""
+        DELETE FROM post_tags a USING post_tags b
+        WHERE a.post_id = b.post_id AND a.tag_id = b.tag_id AND a.id > b.id
+    """)
+    # CONCURRENTLY не блокує запис у таблиці, але не може виконуватись у транзакції
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
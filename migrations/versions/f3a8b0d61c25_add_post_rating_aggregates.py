@@ -0,0 +1,114 @@
+"""Add post rating aggregates
+
+Revision ID: f3a8b0d61c25
+Revises: e91b4c6d2a83
+Create Date: 2026-10-18 13:52:19.084512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8b0d61c25'
+down_revision: Union[str, None] = 'e91b4c6d2a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('uq_post_ratings_user_id_post_id', 'post_ratings', ['user_id', 'post_id'], True),
+    ('ix_posts_rating_top', 'posts', [sa.text('rating_avg DESC'), sa.text('rating_count DESC'), sa.text('id DESC')], False),
+]
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Один голос на користувача: лишаємо по одному рейтингу на пару (user_id, post_id)
+    op.execute("""
+        DELETE FROM post_ratings a USING post_ratings b
+        WHERE a.user_id = b.user_id AND a.post_id = b.post_id AND a.id > b.id
+    """)
+
+    # Колонки з константним default додаються без перезапису таблиці; середнє підтримує тригер, а не GENERATED
+    op.add_column('posts', sa.Column('rating_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('posts', sa.Column('rating_sum', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('posts', sa.Column('rating_avg', sa.Numeric(3, 2), server_default=sa.text('0'), nullable=False))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION post_rating_avg(total integer, score integer) RETURNS numeric AS $$
+            SELECT CASE WHEN total > 0 THEN round(score::numeric / total, 2) ELSE 0 END
+        $$ LANGUAGE sql IMMUTABLE
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION post_ratings_maintain_aggregates() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE posts SET rating_count = rating_count - 1, rating_sum = rating_sum - OLD.rating,
+                                 rating_avg = post_rating_avg(rating_count - 1, rating_sum - OLD.rating)
+                WHERE id = OLD.post_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE posts SET rating_count = rating_count + 1, rating_sum = rating_sum + NEW.rating,
+                                 rating_avg = post_rating_avg(rating_count + 1, rating_sum + NEW.rating)
+                WHERE id = NEW.post_id;
+                RETURN NEW;
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER post_ratings_aggregates
+        AFTER INSERT OR DELETE OR UPDATE OF rating, post_id ON post_ratings
+        FOR EACH ROW EXECUTE FUNCTION post_ratings_maintain_aggregates()
+    """)
+
+    with op.get_context().autocommit_block():
+        # Партії по первинному ключу posts, кожна у своїй транзакції. SHARE-блокування post_ratings
+        # на час партії не дає тригеру й перерахунку перезаписати один одного
+        op.execute(f"""
+            DO $$
+            DECLARE
+                batch uuid[];
+                last_id uuid;
+            BEGIN
+                LOOP
+                    LOCK TABLE post_ratings IN SHARE MODE;
+                    SELECT array_agg(id ORDER BY id) INTO batch FROM (
+                        SELECT id FROM posts WHERE last_id IS NULL OR id > last_id
+                        ORDER BY id LIMIT {BACKFILL_BATCH_SIZE}
+                    ) AS ids;
+                    EXIT WHEN batch IS NULL;
+                    UPDATE posts SET rating_count = agg.total, rating_sum = agg.score,
+                                     rating_avg = post_rating_avg(agg.total, agg.score)
+                    FROM (
+                        SELECT post_id, count(*)::integer AS total, sum(rating)::integer AS score
+                        FROM post_ratings WHERE post_id = ANY(batch) GROUP BY post_id
+                    ) AS agg
+                    WHERE posts.id = agg.post_id;
+                    last_id := batch[array_length(batch, 1)];
+                    COMMIT;
+                END LOOP;
+            END
+            $$
+        """)
+        # CONCURRENTLY не блокує запис, але не може виконуватись у транзакції
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS post_ratings_aggregates ON post_ratings")
+    op.execute("DROP FUNCTION IF EXISTS post_ratings_maintain_aggregates()")
+    op.execute("DROP FUNCTION IF EXISTS post_rating_avg(integer, integer)")
+    op.drop_column('posts', 'rating_avg')
+    op.drop_column('posts', 'rating_sum')
+    op.drop_column('posts', 'rating_count')
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark: import time of main.py and time to first 200 from the health checker.
+
+Usage (from the project root, with Postgres and Redis reachable for the HTTP part):
+    python scripts/cold_start_benchmark.py                    # compare with the baseline
+    python scripts/cold_start_benchmark.py --update-baseline  # record a new baseline
+    python scripts/cold_start_benchmark.py --skip-http        # import time only
+"""
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_FILE = Path(__file__).resolve().with_name("cold_start_baseline.json")
+HEALTH_PATH = "/api/general/health_checker"
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def measure_import() -> float:
+    # Кожен замір — новий інтерпретатор, щоб не було прогрітого sys.modules
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(timeout: float) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{HEALTH_PATH}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                pass
+            time.sleep(0.02)
+        raise TimeoutError(f"no 200 from {HEALTH_PATH} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(samples: list[float]) -> dict:
+    return {"median": round(statistics.median(samples), 4), "min": round(min(samples), 4), "max": round(max(samples), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression of the median, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    results = {"import_seconds": summarize([measure_import() for _ in range(args.runs)])}
+    if not args.skip_http:
+        results["first_200_seconds"] = summarize([measure_first_response(args.timeout) for _ in range(args.runs)])
+    print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        baseline.update(results)
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return
+
+    if not BASELINE_FILE.exists():
+        print("No baseline recorded yet, run with --update-baseline")
+        return
+    baseline = json.loads(BASELINE_FILE.read_text())
+    regressed = False
+    for name, summary in results.items():
+        if name not in baseline:
+            # Метрика без базової лінії не може пройти перевірку мовчки
+            print(f"{name}: {summary['median']}s, no baseline recorded, run with --update-baseline")
+            regressed = True
+            continue
+        limit = baseline[name]["median"] * (1 + args.tolerance)
+        status = "OK" if summary["median"] <= limit else "REGRESSION"
+        regressed |= status == "REGRESSION"
+        print(f"{name}: {summary['median']}s (baseline {baseline[name]['median']}s) {status}")
+    for name in baseline.keys() - results.keys():
+        print(f"{name}: not measured in this run")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Load test: mixed API scenarios against a local stack with a fake Cloudinary server.
+
+The app runs against real Postgres and Redis (e.g. `docker compose up db redis`), because
+triggers, tsvector search and the rate limiter depend on them. Cloudinary is replaced by a
+local HTTP server via CLOUDINARY_API_URL, so uploads never leave the machine.
+
+Usage (from the project root):
+    python scripts/load_test.py                                # boot the app, run, compare with baseline
+    python scripts/load_test.py --base-url http://127.0.0.1:8000  # use an already running app
+    python scripts/load_test.py --update-baseline              # record a new baseline
+
+The booted app runs with RATE_LIMIT_ENABLED=false: the benchmark measures the API, not the
+429 path. An app started with --base-url must itself disable the limiter and point
+CLOUDINARY_API_URL at the fake server (--fake-cloudinary-port fixes its port). Any 429 in a run
+is reported as a regression and blocks --update-baseline.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_FILE = Path(__file__).resolve().with_name("load_test_baseline.json")
+HEALTH_PATH = "/api/general/health_checker"
+# 1x1 PNG — вміст файлу не важливий, fake Cloudinary його не декодує
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=="
+)
+PASSWORD = "load-test-password"
+
+
+class FakeCloudinaryHandler(BaseHTTPRequestHandler):
+    # Відповідає лише на ті виклики, які робить CloudinaryService: upload і delete
+    def _reply(self, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _drain(self):
+        # Тіло може прийти як з Content-Length, так і chunked
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                self.rfile.read(size + 2)
+                if size == 0:
+                    break
+        else:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        self._drain()
+        time.sleep(self.server.latency)
+        self._reply({"public_id": f"user_posts/load/{uuid.uuid4().hex}", "version": int(time.time())})
+
+    def do_DELETE(self):
+        self._reply({"deleted": {}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_cloudinary(port: int, latency: float = 0.0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeCloudinaryHandler)
+    server.latency = latency  # імітація мережевої затримки Cloudinary на upload, секунди
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot_app(cloudinary_port: int, timeout: float) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "CLOUDINARY_API_URL": f"http://127.0.0.1:{cloudinary_port}/v1_1",
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(base_url + HEALTH_PATH, timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise TimeoutError(f"app did not become healthy within {timeout}s")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, name: str, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.TransportError:
+            response, status = None, 0
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][status] += 1
+        return response
+
+    def report(self, duration: float) -> dict:
+        results = {}
+        for name, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            statuses = self.statuses[name]
+            results[name] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / duration, 2),
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+                "errors": sum(count for status, count in statuses.items() if status == 0 or status >= 500),
+                "throttled": statuses.get(429, 0),
+            }
+        return results
+
+
+def percentile(samples: list[float], q: float) -> float:
+    # Nearest-rank на відсортованій вибірці
+    index = max(0, min(len(samples) - 1, round(q / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+async def prepare(client: httpx.AsyncClient, users: int, posts: int) -> dict:
+    # Окремі користувачі для кожного прогону, щоб не залежати від стану БД
+    run_id = uuid.uuid4().hex[:8]
+    accounts = []
+    for i in range(users):
+        email = f"load-{run_id}-{i}@example.com"
+        response = await client.post("/api/auth/signup", json={
+            "email": email, "password": PASSWORD, "full_name": f"Load Test {i:04d}", "age": 30, "gender": "M",
+        })
+        response.raise_for_status()
+        response = await client.post("/api/auth/login", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        accounts.append({"email": email, "token": response.json()["access_token"]})
+
+    post_ids = []
+    for i in range(posts):
+        account = accounts[i % len(accounts)]
+        response = await client.post(
+            "/api/posts/",
+            headers={"Authorization": f"Bearer {account['token']}"},
+            data={"title": f"Load post {i}", "description": "load test", "tags": "load,bench"},
+            files={"image": ("load.png", PNG, "image/png")},
+        )
+        response.raise_for_status()
+        post_id = response.json()["id"]
+        post_ids.append(post_id)
+        await client.post(
+            "/api/comments/", params={"post_id": post_id, "message": "first"},
+            headers={"Authorization": f"Bearer {account['token']}"},
+        )
+    return {"accounts": accounts, "post_ids": post_ids}
+
+
+def scenarios(recorder: Recorder, state: dict) -> list[tuple[float, callable]]:
+    async def browse_feed(client, auth):
+        await recorder.call("GET /api/posts/feed", client, "GET", "/api/posts/feed", headers=auth,
+                            params={"limit": 20})
+
+    async def read_post(client, auth):
+        post_id = random.choice(state["post_ids"])
+        await recorder.call("GET /api/posts/{post_id}", client, "GET", f"/api/posts/{post_id}", headers=auth)
+
+    async def read_comments(client, auth):
+        post_id = random.choice(state["post_ids"])
+        await recorder.call("GET /api/comments/{post_id}/page", client, "GET", f"/api/comments/{post_id}/page",
+                            headers=auth)
+
+    async def login(client, auth):
+        account = random.choice(state["accounts"])
+        await recorder.call("POST /api/auth/login", client, "POST", "/api/auth/login",
+                            data={"username": account["email"], "password": PASSWORD})
+
+    async def upload(client, auth):
+        await recorder.call("POST /api/posts/", client, "POST", "/api/posts/", headers=auth,
+                            data={"title": "Load upload", "description": "load test", "tags": "load"},
+                            files={"image": ("load.png", PNG, "image/png")})
+
+    async def transform(client, auth):
+        post_id = random.choice(state["post_ids"])
+        size = random.choice((64, 128, 256))
+        await recorder.call("POST /api/images/resize", client, "POST", "/api/images/resize", headers=auth,
+                            params={"post_id": post_id, "width": size, "height": size, "crop": "fill"})
+
+    # Ваги відтворюють типовий трафік: переважно читання
+    return [(40, browse_feed), (20, read_post), (20, read_comments), (8, login), (4, upload), (8, transform)]
+
+
+async def run(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        state = await prepare(client, args.users, args.posts)
+        recorder = Recorder()
+        weights, actions = zip(*scenarios(recorder, state))
+        deadline = time.perf_counter() + args.duration
+
+        async def worker(index: int):
+            auth = {"Authorization": f"Bearer {state['accounts'][index % len(state['accounts'])]['token']}"}
+            while time.perf_counter() < deadline:
+                await random.choices(actions, weights)[0](client, auth)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        return recorder.report(time.perf_counter() - started)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    regressed = False
+    for name, current in results.items():
+        problems = []
+        # Відповіді 429 означають, що виміряно ліміт, а не API
+        if current["throttled"]:
+            problems.append(f"throttled {current['throttled']}")
+        previous = baseline.get(name)
+        if previous is None:
+            regressed |= bool(problems)
+            print(f"{name}: {'REGRESSION ' + '; '.join(problems) if problems else 'no baseline'}")
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            problems.append(f"p95 {current['p95_ms']}ms > {previous['p95_ms']}ms")
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            problems.append(f"rps {current['rps']} < {previous['rps']}")
+        if current["errors"] > previous["errors"]:
+            problems.append(f"errors {current['errors']} > {previous['errors']}")
+        regressed |= bool(problems)
+        print(f"{name}: {'REGRESSION ' + '; '.join(problems) if problems else 'OK'}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="target an already running app instead of booting one")
+    parser.add_argument("--fake-cloudinary-port", type=int, default=0)
+    parser.add_argument("--cloudinary-latency", type=float, default=0.05, help="fake upload latency, seconds")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load after setup")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    fake_cloudinary = start_fake_cloudinary(args.fake_cloudinary_port, args.cloudinary_latency)
+    process = None
+    try:
+        base_url = args.base_url
+        if base_url is None:
+            process, base_url = boot_app(fake_cloudinary.server_address[1], args.timeout)
+        results = asyncio.run(run(base_url, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        fake_cloudinary.shutdown()
+
+    print(json.dumps(results, indent=2))
+    if args.update_baseline:
+        throttled = {name: result["throttled"] for name, result in results.items() if result["throttled"]}
+        if throttled:
+            sys.exit(f"Refusing to record a baseline with throttled requests: {throttled}")
+        BASELINE_FILE.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return
+    if not BASELINE_FILE.exists():
+        print("No baseline recorded yet, run with --update-baseline")
+        return
+    sys.exit(1 if compare(results, json.loads(BASELINE_FILE.read_text()), args.tolerance) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Full-text post search on a million-post table.
+
+Creates a dedicated database (SEARCH_BENCH_DB, default alphadb_search_bench), migrates it to the
+revision before full-text search, seeds --posts posts with a skewed vocabulary, then times the
+search migration itself (nullable column + trigger + batched backfill + GIN index CONCURRENTLY)
+and the latency of repository.posts.search_posts for common, mid-frequency and rare terms.
+
+Usage (from the project root, with PostgreSQL reachable, e.g. `docker compose up db`):
+    python scripts/search_benchmark.py --posts 1000000
+
+Reference run (1M posts, PostgreSQL 18 on loopback, 1 vCPU, 10 runs of two pages each),
+SEARCH_CANDIDATE_LIMIT=1000; seeding 42s, search migration 71s with writes allowed during the backfill:
+    query                           matches   p50      p99     (unbounded ranking: p50 / p99)
+    common term   'w0'               680489    35ms     79ms   (5958ms / 6833ms)
+    mid term      'w50'               13927   306ms    367ms   ( 250ms /  276ms)
+    rare term     'w4000'               557    30ms     37ms   (  44ms /   47ms)
+    AND           'w50 w4000'             5     6ms      7ms   (  19ms /   24ms)
+    OR            'w50 or w4000'      14479   273ms    359ms   ( 384ms /  479ms)
+Only the newest SEARCH_CANDIDATE_LIMIT matches are ranked, so the cost is capped by
+min(matches, candidates / selectivity) rows instead of growing with every match. The slowest case
+is a mid-frequency term (~1-3% of posts), where either plan touches tens of thousands of rows.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# База для бенчмарку задається до імпорту src
+os.environ["POSTGRES_DB"] = os.environ.get("SEARCH_BENCH_DB", "alphadb_search_bench")
+
+import asyncpg  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from src.core import config  # noqa: E402
+from src.db.database import sessionmanager  # noqa: E402
+from src.repository.posts import search_posts  # noqa: E402
+
+BEFORE_SEARCH_REVISION = "f3a8b0d61c25"
+VOCABULARY = 5000
+USERS = 10_000
+
+# Слово з індексом floor(V * random()^4): кілька слів трапляються в більшості постів, решта — рідко
+WORD = f"'w' || floor({VOCABULARY} * power(random(), 4))::int"
+
+QUERIES = {
+    "common term": "w0",
+    "mid-frequency term": "w50",
+    "rare term": "w4000",
+    "two terms (AND)": "w50 w4000",
+    "either term (OR)": "w50 or w4000",
+}
+
+
+def alembic(revision: str):
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", revision], cwd=ROOT, env=os.environ.copy(),
+                   check=True, capture_output=True)
+
+
+async def recreate_database():
+    db_config = config.db_config
+    conn = await asyncpg.connect(
+        host=db_config.POSTGRES_HOST, port=db_config.POSTGRES_PORT, user=db_config.POSTGRES_USER,
+        password=str(db_config.POSTGRES_PASSWORD), database="postgres",
+    )
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS "{db_config.POSTGRES_DB}" WITH (FORCE)')
+        await conn.execute(f'CREATE DATABASE "{db_config.POSTGRES_DB}"')
+    finally:
+        await conn.close()
+
+
+async def seed(posts: int):
+    async with sessionmanager.engine.begin() as conn:
+        await conn.execute(text(f"""
+            INSERT INTO users (full_name, email, password, age, gender, role)
+            SELECT 'User ' || i, 'user' || i || '@example.com', 'x', 30, 'M', 'user'
+            FROM generate_series(0, {USERS - 1}) AS i
+        """))
+        await conn.execute(text(f"""
+            INSERT INTO posts (user_id, title, description, image_url, created_at, updated_at)
+            SELECT u.id,
+                   {WORD} || ' ' || {WORD} || ' ' || {WORD},
+                   {WORD} || ' ' || {WORD} || ' ' || {WORD} || ' ' || {WORD} || ' ' || {WORD} || ' ' || {WORD},
+                   'https://example.com/' || i || '.jpg', now() - i * interval '1 second', now()
+            FROM generate_series(0, {posts - 1}) AS i
+            JOIN users u ON u.email = 'user' || (i % {USERS}) || '@example.com'
+        """))
+    async with sessionmanager.engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE posts"))
+
+
+async def measure(query: str, repeat: int) -> dict:
+    samples = []
+    async with sessionmanager.session() as db:
+        matches = (await db.execute(
+            text("SELECT count(*) FROM posts WHERE search_vector @@ websearch_to_tsquery('simple', :q)"), {"q": query}
+        )).scalar_one()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows, has_more = await search_posts(query, 20, None, db)
+            if has_more:
+                last_post, last_rank = rows[-1]
+                await search_posts(query, 20, (last_rank, last_post.id), db)
+            samples.append(time.perf_counter() - started)
+            db.expunge_all()
+    samples.sort()
+    return {
+        "matches": matches,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p99_ms": samples[min(len(samples) - 1, round(0.99 * len(samples)) - 1)] * 1000,
+    }
+
+
+async def run(args):
+    await recreate_database()
+    alembic(BEFORE_SEARCH_REVISION)
+    started = time.perf_counter()
+    await seed(args.posts)
+    print(f"seeded {args.posts} posts in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    alembic("head")
+    print(f"search migration (backfill + GIN CONCURRENTLY): {time.perf_counter() - started:.1f}s")
+    async with sessionmanager.engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE posts"))
+
+    # Перша сторінка і наступна по курсору, як у GET /api/posts/search
+    for name, query in QUERIES.items():
+        result = await measure(query, args.repeat)
+        print(f"{name:20} {query!r:18} matches={result['matches']:>8} "
+              f"p50={result['p50_ms']:8.1f}ms p99={result['p99_ms']:8.1f}ms")
+    await sessionmanager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query (two pages each)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
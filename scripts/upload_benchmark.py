@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""p99 of GET /api/posts/ while concurrent uploads run against a fake Cloudinary server.
+
+Boots the app like scripts/load_test.py (real Postgres and Redis, limiter off, Cloudinary replaced
+by a local HTTP stand-in), measures GET /api/posts/ latency on an idle app, then again while
+--uploads uploads are in flight. A blocking upload path shows up as a p99 jump in the second run.
+
+Reference run (1 vCPU, 50 uploads x 5MB, fake Cloudinary latency 0.2s, 10s per phase):
+    sync file handed to httpx:      idle p99 16.8ms, in flight p50 47.1ms p99 313.4ms
+    async UploadFile.read chunks:   idle p99 20.4ms, in flight p50 26.6ms p99 179.5ms
+
+Usage (from the project root):
+    python scripts/upload_benchmark.py --uploads 50 --upload-size 5000000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_test import PASSWORD, boot_app, percentile, start_fake_cloudinary  # noqa: E402
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, duration: float) -> list[float]:
+    # Послідовні запити: кожен вимір — чиста затримка одного GET
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/api/posts/", headers=headers, params={"limit": 10})
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)
+
+
+async def upload_loop(client: httpx.AsyncClient, headers: dict, payload: bytes, stop: asyncio.Event, done: list):
+    while not stop.is_set():
+        response = await client.post(
+            "/api/posts/", headers=headers,
+            data={"title": "Upload bench", "description": "upload benchmark", "tags": "bench"},
+            files={"image": ("bench.jpg", payload, "image/jpeg")},
+        )
+        response.raise_for_status()
+        done.append(1)
+
+
+def summary(name: str, samples: list[float]) -> str:
+    return (f"{name}: n={len(samples)} p50={percentile(samples, 50) * 1000:.1f}ms "
+            f"p99={percentile(samples, 99) * 1000:.1f}ms max={samples[-1] * 1000:.1f}ms")
+
+
+async def run(base_url: str, args):
+    limits = httpx.Limits(max_connections=args.uploads + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        email = f"upload-bench-{uuid.uuid4().hex[:8]}@example.com"
+        response = await client.post("/api/auth/signup", json={
+            "email": email, "password": PASSWORD, "full_name": "Upload Benchmark", "age": 30, "gender": "M",
+        })
+        response.raise_for_status()
+        response = await client.post("/api/auth/login", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        idle = await probe(client, headers, args.duration)
+
+        payload = os.urandom(args.upload_size)
+        stop, done = asyncio.Event(), []
+        uploads = [asyncio.create_task(upload_loop(client, headers, payload, stop, done)) for _ in range(args.uploads)]
+        await asyncio.sleep(args.warmup)
+        busy = await probe(client, headers, args.duration)
+        stop.set()
+        await asyncio.gather(*uploads)
+
+    print(summary("idle", idle))
+    print(summary(f"{args.uploads} uploads in flight", busy))
+    print(f"uploads completed: {len(done)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="target an already running app instead of booting one")
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--upload-size", type=int, default=5_000_000, help="bytes; above 1MB UploadFile spills to disk")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of probing per phase")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds between starting uploads and probing")
+    parser.add_argument("--cloudinary-latency", type=float, default=0.2, help="fake upload latency, seconds")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    fake_cloudinary = start_fake_cloudinary(0, args.cloudinary_latency)
+    process = None
+    try:
+        base_url = args.base_url
+        if base_url is None:
+            process, base_url = boot_app(fake_cloudinary.server_address[1], args.timeout)
+        asyncio.run(run(base_url, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        fake_cloudinary.shutdown()
+
+
+if __name__ == "__main__":
+    main()
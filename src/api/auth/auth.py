@@ -4,9 +4,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.database import get_db
 from src.repository import user as repositories_users
-from src.schemas.user import UserCreationSchema, TokenSchema, UserResponseSchema
+from src.schemas.user import UserCreationSchema, TokenSchema, UserResponseSchema, UserSnapshotSchema, SessionSchema
 from src.core import log
 from src.services.auth import auth_service
+from src.services.token_cache import token_cache
+from src.services.refresh_tokens import refresh_token_store, ROTATED, REUSED
 
 auth_router = APIRouter(prefix='/auth', tags=['auth'])
 get_refresh_token = HTTPBearer()
@@ -17,39 +19,73 @@ async def signup(body: UserCreationSchema, request: Request, db: AsyncSession =
     exist_user = await repositories_users.get_user_by_email(body.email, db)
     if exist_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account already exists")
-    body.password = auth_service.get_password_hash(body.password)
+    body.password = await auth_service.get_password_hash(body.password)
     new_user = await repositories_users.create_user(body, db)
     log.info(f"User {new_user.email} created")
     return new_user
 
 @auth_router.post("/login",  response_model=TokenSchema)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login(request: Request, body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     user = await repositories_users.get_user_by_email(body.username, db)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email")
     if not user.is_active:
          raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is banned and cannot log in")
-    if not auth_service.verify_password(body.password, user.password):
+    if not await auth_service.verify_password(body.password, user.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
-    # Generate JWT
-    access_token = await auth_service.create_access_token(data={"sub": user.email})
-    refresh_token = await auth_service.create_refresh_token(data={"sub": user.email})
-    await repositories_users.update_token(user, refresh_token, db)
+    # Кожен вхід — окрема сесія (пристрій) у Redis, без запису в Postgres
+    sid, jti = await refresh_token_store.issue(user.email, request.headers.get("user-agent", "unknown")[:200])
+    access_token = await auth_service.create_access_token(data={"sub": user.email, "sid": sid})
+    refresh_token = await auth_service.create_refresh_token(data={"sub": user.email, "sid": sid, "jti": jti})
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
 @auth_router.get('/refresh_token',  response_model=TokenSchema)
 async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(get_refresh_token),
                         db: AsyncSession = Depends(get_db)):
-    token = credentials.credentials
-    email = await auth_service.decode_refresh_token(token)
-    user = await repositories_users.get_user_by_email(email, db)
-    if user.refresh_token != token:
-        await repositories_users.update_token(user, None, db)
+    claims = await auth_service.decode_refresh_token(credentials.credentials)
+    email, sid = claims["sub"], claims["sid"]
+    user = await auth_service.get_user_snapshot(email, db)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    if not user.is_active:
+        await refresh_token_store.revoke_all(email)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is banned")
+
+    result, jti = await refresh_token_store.rotate(email, sid, claims["jti"])
+    if result == REUSED:
+        log.warning(f"Refresh token reuse detected for {email}, session {sid} revoked")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected")
+    if result != ROTATED:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-    access_token = await auth_service.create_access_token(data={"sub": email})
-    refresh_token = await auth_service.create_refresh_token(data={"sub": email})
-    await repositories_users.update_token(user, refresh_token, db)
+    access_token = await auth_service.create_access_token(data={"sub": email, "sid": sid})
+    refresh_token = await auth_service.create_refresh_token(data={"sub": email, "sid": sid, "jti": jti})
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
+
+@auth_router.post('/logout', status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(auth_service.oauth2_scheme),
+                 user: UserSnapshotSchema = Depends(auth_service.authenticate_user)):
+    claims = auth_service.get_access_claims(token)
+    # Відкликається лише refresh-сесія; access-токен діє до exp (див. README, "Сесії та токени")
+    if claims and claims.get("sid"):
+        await refresh_token_store.revoke(user.email, claims["sid"])
+    token_cache.evict_user(user.email)
+
+
+@auth_router.get('/sessions', response_model=list[SessionSchema])
+async def list_sessions(user: UserSnapshotSchema = Depends(auth_service.authenticate_user)):
+    return await refresh_token_store.sessions(user.email)
+
+
+@auth_router.delete('/sessions', status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_all_sessions(user: UserSnapshotSchema = Depends(auth_service.authenticate_user)):
+    await refresh_token_store.revoke_all(user.email)
+    token_cache.evict_user(user.email)
+
+
+@auth_router.delete('/sessions/{session_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_session(session_id: str, user: UserSnapshotSchema = Depends(auth_service.authenticate_user)):
+    if not await refresh_token_store.revoke(user.email, session_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
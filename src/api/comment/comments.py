@@ -1,15 +1,18 @@
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.db.database import get_db
+from src.db.database import get_db, sessionmanager
 from src.models.posts import Comment
 from src.models.users import Role
-from src.schemas.comments import CommentSchema
-from src.models.users import User
+from src.schemas.comments import CommentSchema, CommentPageSchema
+from src.schemas.user import UserSnapshotSchema
 from src.services.auth import auth_service
 from src.services.roles import RoleAccessService
 from src.repository.posts import get_post
 from src.repository import comments as repository_comments
+from src.services.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 router_admin_moderator_comments = APIRouter(prefix="/admin_moderator", tags=["admin or moderator"])
@@ -22,7 +25,7 @@ admin_or_moderator = [Role.admin, Role.moderator]
 async def create_comment(
     post_id: UUID,
     message: str,
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
     db: AsyncSession = Depends(get_db),
 ):
     post = await get_post(post_id, db)
@@ -34,6 +37,26 @@ async def create_comment(
     return await repository_comments.create_comment(post_id, user.id, message, db)
 
 
+@router.get("/{post_id}/page", response_model=CommentPageSchema, status_code=status.HTTP_200_OK)
+async def get_comments_page(post_id: UUID, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = Query(None),
+                            db: AsyncSession = Depends(get_db)):
+    after = decode_cursor(cursor) if cursor else None
+    comments, has_more = await repository_comments.get_comments_after(post_id, limit, after, db)
+    next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id) if has_more else None
+    return CommentPageSchema(items=comments, next_cursor=next_cursor)
+
+
+@router.get("/{post_id}/stream", status_code=status.HTTP_200_OK)
+async def stream_comments(post_id: UUID):
+    async def ndjson():
+        # Власна сесія: залежності з yield закриваються до того, як відповідь буде відправлена
+        async with sessionmanager.session() as db:
+            async for comment in repository_comments.stream_comments(post_id, db):
+                yield CommentSchema.model_validate(comment).model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/{post_id}", response_model=list[CommentSchema], status_code=status.HTTP_200_OK)
 async def get_comments(post_id: UUID, db: AsyncSession = Depends(get_db)):
     return await repository_comments.get_comments(post_id, db)
@@ -43,7 +66,7 @@ async def get_comments(post_id: UUID, db: AsyncSession = Depends(get_db)):
 async def update_comment(
     comment_id: UUID,
     message: str,
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
     db: AsyncSession = Depends(get_db),
 ):
     comment = await db.get(Comment, comment_id)
@@ -59,7 +82,7 @@ async def update_comment(
 @router_admin_moderator_comments.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
     comment_id: UUID,
-    user: User = Depends(admin_or_moderator_access),
+    user: UserSnapshotSchema = Depends(admin_or_moderator_access),
     db: AsyncSession = Depends(get_db),
 ):
     comment = await db.get(Comment, comment_id)
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import get_db
+from src.db.database import get_db, sessionmanager
 from src.core import log
+from src.core.metrics import registry
 
 general_check_router = APIRouter(prefix='/general', tags=['general'])
 
@@ -23,4 +25,14 @@ async def health_checker(db: AsyncSession = Depends(get_db)):
 
     except Exception as e:
         log.error(e)
-        raise HTTPException(status_code=500, detail="Error connecting to the database")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Error connecting to the database")
+
+
+@general_check_router.get("/db_pool")
+async def db_pool_stats():
+    return sessionmanager.pool_stats()
+
+
+@general_check_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,2 +1,3 @@
 from .post import router as post_router
-from .tag import router as tag_router
\ No newline at end of file
+from .tag import router as tag_router
+from .rating import router as rating_router
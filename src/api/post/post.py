@@ -1,24 +1,28 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, File, Form, HTTPException, Depends, UploadFile, status, Query
+from fastapi import APIRouter, File, Form, HTTPException, Depends, Response, UploadFile, status, Query
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi_limiter.depends import RateLimiter
+from src.services.rate_limit import RateLimit
 
 from src.db.database import get_db
-from src.models import User
+from src.schemas.user import UserSnapshotSchema
 from src.models.users import Role
 from src.repository import posts as repositories_posts
-from src.schemas.post import PostResponseSchema
+from src.schemas.post import PostResponseSchema, PostPageSchema
 from src.services.roles import RoleAccessService
 from src.services.image import cloudinary_service
 from src.services.auth import auth_service  
+from src.services.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from src.services.post_cache import post_cache
 
 
 router = APIRouter(prefix='/posts', tags=['posts'])
 all_roles_access = RoleAccessService([role for role in Role])
+posts_adapter = TypeAdapter(list[PostResponseSchema])
 
 
-@router.get('/', response_model=list[PostResponseSchema], dependencies=[Depends(RateLimiter(times=10, seconds=20))])
+@router.get('/', response_model=list[PostResponseSchema], dependencies=[Depends(RateLimit("posts:read"))])
 async def get_posts(limit: int = Query(10, ge=10, le=500), offset: int = Query(0, ge=0),
                        db: AsyncSession = Depends(get_db)):
 
@@ -26,27 +30,53 @@ async def get_posts(limit: int = Query(10, ge=10, le=500), offset: int = Query(0
     return posts
 
 
-@router.get('/{post_id}', response_model=PostResponseSchema, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
+@router.get('/feed', response_model=PostPageSchema, dependencies=[Depends(RateLimit("posts:read"))])
+async def get_posts_feed(limit: int = Query(10, ge=10, le=500), cursor: Optional[str] = Query(None),
+                         db: AsyncSession = Depends(get_db)):
+    after = decode_cursor(cursor) if cursor else None
+    posts, has_more = await repositories_posts.get_posts_after(limit, after, db)
+    next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id) if has_more else None
+    return PostPageSchema(items=posts, next_cursor=next_cursor)
+
+
+@router.get('/search', response_model=PostPageSchema, dependencies=[Depends(RateLimit("posts:read"))])
+async def search_posts(q: str = Query(..., min_length=1, max_length=200), limit: int = Query(10, ge=1, le=100),
+                       cursor: Optional[str] = Query(None), db: AsyncSession = Depends(get_db)):
+    after = decode_rank_cursor(cursor) if cursor else None
+    rows, has_more = await repositories_posts.search_posts(q, limit, after, db)
+    next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].Post.id) if has_more else None
+    return PostPageSchema(items=[row.Post for row in rows], next_cursor=next_cursor)
+
+
+@router.get('/{post_id}', response_model=PostResponseSchema, dependencies=[Depends(RateLimit("posts:read"))])
 async def get_post(post_id: UUID, db: AsyncSession = Depends(get_db)):
 
+    async def load():
+        post = await repositories_posts.get_post(post_id, db)
+        return PostResponseSchema.model_validate(post).model_dump_json() if post else None
 
-    post = await repositories_posts.get_post(post_id, db)
-    if post is None:
+    payload = await post_cache.get_or_load(post_cache.post_key(post_id), load)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    return post
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get('/tags/{tag_name}', response_model=list[PostResponseSchema], dependencies=[Depends(RateLimiter(times=10, seconds=20))])
+@router.get('/tags/{tag_name}', response_model=list[PostResponseSchema], dependencies=[Depends(RateLimit("posts:read"))])
 async def get_posts_by_tag(tag_name: str, db: AsyncSession = Depends(get_db)):
-    posts = await repositories_posts.get_posts_by_tag(tag_name, db)
-    if posts is None:
+
+    async def load():
+        posts = await repositories_posts.get_posts_by_tag(tag_name, db)
+        return posts_adapter.dump_json(posts_adapter.validate_python(posts, from_attributes=True)) if posts is not None else None
+
+    payload = await post_cache.get_or_load(post_cache.tag_key(tag_name), load)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Posts not found by this tag")
-    return posts
+    return Response(content=payload, media_type="application/json")
 
 
-@router.post('/', response_model=PostResponseSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
+@router.post('/', response_model=PostResponseSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RateLimit("posts:write"))])
 async def create_post(title: str = Form(...), description: str = Form(...), image: UploadFile = File(...),tags: Optional[List[str]] = Form(default=[]), db: AsyncSession = Depends(get_db),
-                         user: User = Depends(all_roles_access)):
+                         user: UserSnapshotSchema = Depends(all_roles_access)):
     if tags and tags[0]:
         tags = tags[0].split(",")
     else:
@@ -57,20 +87,17 @@ async def create_post(title: str = Form(...), description: str = Form(...), imag
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File is not an image")
     image_url = await cloudinary_service.upload(image, user.email)
     
+    cleaned_tags = [tag_name.strip() for tag_name in tags if tag_name.strip()]
     try:
-        post = await repositories_posts.create_post(title, description, image_url, user.id, db)
+        post = await repositories_posts.create_post(title, description, image_url, user.id, db, cleaned_tags)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to create post: {e}")
-    for tag_name in tags:
-        cleaned_tag = tag_name.strip()
-        if cleaned_tag:
-            await repositories_posts.add_tag_for_post(post.id, cleaned_tag, db)
 
     return await repositories_posts.get_post(post.id, db)
 
 
-@router.patch("/{post_id}", response_model=PostResponseSchema, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
-async def update_post(title: Optional[str], description: Optional[str], post_id: UUID, user: User = Depends(all_roles_access), db: AsyncSession = Depends(get_db)):
+@router.patch("/{post_id}", response_model=PostResponseSchema, dependencies=[Depends(RateLimit("posts:write"))])
+async def update_post(title: Optional[str], description: Optional[str], post_id: UUID, user: UserSnapshotSchema = Depends(all_roles_access), db: AsyncSession = Depends(get_db)):
 
     post = await repositories_posts.get_post(post_id, db)
 
@@ -89,8 +116,8 @@ async def update_post(title: Optional[str], description: Optional[str], post_id:
     return post
 
 
-@router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
-async def delete_post( post_id: UUID, user: User = Depends(auth_service.authenticate_user), db: AsyncSession = Depends(get_db)):
+@router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(RateLimit("posts:write"))])
+async def delete_post( post_id: UUID, user: UserSnapshotSchema = Depends(auth_service.authenticate_user), db: AsyncSession = Depends(get_db)):
     
     post = await repositories_posts.get_post(post_id, db)
     if post is None:
@@ -0,0 +1,46 @@
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from src.db.database import get_db
+from src.schemas.user import UserSnapshotSchema
+from src.models.users import Role
+from src.repository import ratings as repositories_ratings
+from src.schemas.post import RatingSummarySchema, TopRatedPostSchema
+from src.services.roles import RoleAccessService
+
+
+router = APIRouter(prefix='/ratings', tags=['ratings'])
+all_roles_access = RoleAccessService([role for role in Role])
+
+
+@router.get('/top', response_model=list[TopRatedPostSchema], status_code=status.HTTP_200_OK)
+async def get_top_rated(limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+    return await repositories_ratings.get_top_rated(limit, db)
+
+
+@router.get('/{post_id}', response_model=RatingSummarySchema, status_code=status.HTTP_200_OK)
+async def get_rating(post_id: UUID, db: AsyncSession = Depends(get_db)):
+    summary = await repositories_ratings.get_rating_summary(post_id, db)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    return RatingSummarySchema(post_id=summary.id, rating_count=summary.rating_count, rating_avg=summary.rating_avg)
+
+
+@router.put('/{post_id}', response_model=RatingSummarySchema, status_code=status.HTTP_200_OK)
+async def rate_post(post_id: UUID, rating: int = Query(..., ge=1, le=5), db: AsyncSession = Depends(get_db),
+                    user: UserSnapshotSchema = Depends(all_roles_access)):
+    try:
+        await repositories_ratings.rate_post(post_id, user.id, rating, db)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    summary = await repositories_ratings.get_rating_summary(post_id, db)
+    return RatingSummarySchema(post_id=summary.id, rating_count=summary.rating_count, rating_avg=summary.rating_avg)
+
+
+@router.delete('/{post_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def unrate_post(post_id: UUID, db: AsyncSession = Depends(get_db), user: UserSnapshotSchema = Depends(all_roles_access)):
+    if not await repositories_ratings.unrate_post(post_id, user.id, db):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rating not found")
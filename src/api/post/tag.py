@@ -4,23 +4,25 @@ from typing import List
 from uuid import UUID
 from fastapi import APIRouter, File, Form, HTTPException, Depends, UploadFile, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi_limiter.depends import RateLimiter
+from src.services.rate_limit import RateLimit
 from sqlalchemy.exc import IntegrityError
 
 from src.db.database import get_db
-from src.models import User
+from src.schemas.user import UserSnapshotSchema
 from src.models.users import Role
+from src.models.posts import MAX_TAGS_CONSTRAINT
 from src.repository import tags as repositories_tags
 from src.repository import posts as repositories_posts
 from src.schemas.post import  PostResponseSchema, TagResponseSchema
 from src.services.roles import RoleAccessService
+from src.services.tag_suggest import tag_suggester
 
 
 router = APIRouter(prefix='/tags', tags=['tags'])
 all_roles_access = RoleAccessService([role for role in Role ])
 
 
-@router.get('/', response_model=list[TagResponseSchema], status_code=status.HTTP_200_OK, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
+@router.get('/', response_model=list[TagResponseSchema], status_code=status.HTTP_200_OK, dependencies=[Depends(RateLimit("tags:read"))])
 async def get_tags_for_post(post_id: UUID, db: AsyncSession = Depends(get_db)):
 
     tags = await repositories_tags.get_tags_for_post(post_id, db)
@@ -28,8 +30,17 @@ async def get_tags_for_post(post_id: UUID, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tags not found for this post")
     return tags
 
-@router.post('/', response_model=PostResponseSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
-async def add_tag_for_post(post_id: UUID, name: str, db: AsyncSession = Depends(get_db), user: User = Depends(all_roles_access),):
+@router.get('/suggest', response_model=list[str], status_code=status.HTTP_200_OK, dependencies=[Depends(RateLimit("tags:suggest"))])
+async def suggest_tags(prefix: str = Query(..., min_length=1, max_length=50), limit: int = Query(10, ge=1, le=50),
+                       db: AsyncSession = Depends(get_db)):
+    await tag_suggester.ensure_loaded(db)
+    suggestions = tag_suggester.suggest(prefix, limit)
+    if suggestions is None:
+        suggestions = await repositories_tags.suggest_tags(prefix, limit, db)
+    return suggestions
+
+@router.post('/', response_model=PostResponseSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RateLimit("tags:write"))])
+async def add_tag_for_post(post_id: UUID, name: str, db: AsyncSession = Depends(get_db), user: UserSnapshotSchema = Depends(all_roles_access),):
     post = await repositories_posts.get_post(post_id, db)
     if post is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
@@ -39,12 +50,15 @@ async def add_tag_for_post(post_id: UUID, name: str, db: AsyncSession = Depends(
 
     try:
         await repositories_posts.add_tag_for_post(post_id, name, db)
-    except IntegrityError:
-        raise HTTPException(status_code=400, detail="Cannot add more than 5 tags to a post.")
+    except IntegrityError as e:
+        await db.rollback()
+        if MAX_TAGS_CONSTRAINT in str(e.orig):
+            raise HTTPException(status_code=400, detail="Cannot add more than 5 tags to a post.")
+        raise HTTPException(status_code=400, detail="Cannot add this tag to the post.")
     return await repositories_posts.get_post(post_id, db)
 
-@router.delete('/', status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(RateLimiter(times=10, seconds=20))])
-async def delete_tag_from_post(name: str, post_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(all_roles_access),):
+@router.delete('/', status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(RateLimit("tags:write"))])
+async def delete_tag_from_post(name: str, post_id: UUID, db: AsyncSession = Depends(get_db), user: UserSnapshotSchema = Depends(all_roles_access),):
     tag = await repositories_tags.get_tag_by_name(name, db)
     if tag is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found")
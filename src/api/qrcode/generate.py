@@ -1,26 +1,37 @@
-from io import BytesIO
 from typing import Optional
 
-from fastapi import APIRouter, Response, status, HTTPException, Depends
+from fastapi import APIRouter, Header, Query, Response, status, HTTPException
 from pydantic import HttpUrl
 
-from src.services.qr_code import qrcode_service
+from src.schemas.enums import QrErrorCorrectionEnum
+from src.services.qr_code import QrCodeTooSmall, qrcode_service
 
 router = APIRouter(prefix='/qr_code', tags=['qr_code'])
 
-@router.post("/generate_svg", status_code=status.HTTP_200_OK)
-async def qr_code_svg(url: HttpUrl, size: Optional[int] = 200):
-    svg_code = await qrcode_service.generateSvgAsync(url, size)
-    if not svg_code:
+
+async def _qr_response(url: HttpUrl, size: int, format: str, error_correction: QrErrorCorrectionEnum,
+                       if_none_match: Optional[str], media_type: str) -> Response:
+    try:
+        content, digest = await qrcode_service.render(str(url), size, format, error_correction.value)
+    except QrCodeTooSmall as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate QR code")
-    return Response(content=svg_code, media_type="image/svg+xml")
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+@router.post("/generate_svg", status_code=status.HTTP_200_OK)
+async def qr_code_svg(url: HttpUrl, size: Optional[int] = Query(200, ge=21, le=2000),
+                      error_correction: QrErrorCorrectionEnum = QrErrorCorrectionEnum.H,
+                      if_none_match: Optional[str] = Header(None)):
+    return await _qr_response(url, size, "svg", error_correction, if_none_match, "image/svg+xml")
 
 @router.post("/generate_image", status_code=status.HTTP_200_OK)
-async def qr_code_image(url: HttpUrl, size: Optional[int] = 200):
-    img = await qrcode_service.generatePilImageAsync(url, size)
-    if not img:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate QR code")
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
-    return Response(content=buffer.getvalue(), media_type="image/png")
\ No newline at end of file
+async def qr_code_image(url: HttpUrl, size: Optional[int] = Query(200, ge=21, le=2000),
+                        error_correction: QrErrorCorrectionEnum = QrErrorCorrectionEnum.H,
+                        if_none_match: Optional[str] = Header(None)):
+    return await _qr_response(url, size, "png", error_correction, if_none_match, "image/png")
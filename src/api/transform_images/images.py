@@ -1,23 +1,62 @@
+import asyncio
 from enum import Enum
 from fastapi import APIRouter, status, HTTPException, Depends, UploadFile
 from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from src.repository.transformed_images import get_all_for_user, get as get_ti, save as save_ti, get_by_url
+from src.repository.transformed_images import get_all_for_user, get as get_ti, upsert as upsert_ti, upsert_many as upsert_many_ti
 from src.models.transformed_images import TransformedImage
 from src.schemas.enums import CloudinaryCropEnum, CloudinaryEffectEnum, CloudinaryQualityEnum, CloudinaryFormatEnum
-from src.services.image import cloudinary_service
+from src.services.transform import transform_service, transformation_key
 from src.db.database import get_db
 from src.services.auth import auth_service
-from src.models.users import Role, User
-from src.repository.posts import get_post
+from src.models.users import Role
+from src.schemas.user import UserSnapshotSchema
+from src.repository.posts import get_post, get_post_image_urls
 from src.core import log
-from src.schemas.images import TransformResponseImageSchema
+from src.schemas.images import TransformResponseImageSchema, BatchTransformRequestSchema, BatchTransformResponseSchema
 from src.services.roles import RoleAccessService
 
 router = APIRouter(prefix="/images", tags=["images"])
 admin_moderator_roles_access = RoleAccessService([Role.admin, Role.moderator])
 
+FILTER_LIMITS = {
+    "blur": (1, 200),
+    "pixelate": (1, 200),
+    "oil_paint": (1, 100),
+    "brightness": (-99, 100),
+    "contrast": (-100, 100),
+    "saturation": (-100, 100),
+    "hue": (0, 360),
+    "gamma": (0.01, 9.99),
+    "sharpen": (1, 100),
+    "vignette": (1, 100),
+}
+
+
+def _check_filter_value(effect: CloudinaryEffectEnum, value: int):
+    min_val, max_val = FILTER_LIMITS.get(effect.value, (None, None))
+
+    if min_val is not None and not (min_val <= value <= max_val):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Effect '{effect.value}' must be in range [{min_val}, {max_val}].",
+        )
+
+
+async def _transform(post_id: UUID, image_url: str, spec) -> tuple[str, str]:
+    # Повертає (transformation_key, url) — ті самі ключі, що й в одиночних ендпоінтах
+    if spec.operation == "resize":
+        key = transformation_key(post_id, "resize", {"width": spec.width, "height": spec.height, "crop": spec.crop.value})
+        url = await transform_service.resize(image_url, spec.width, spec.height, spec.crop.value)
+    elif spec.operation == "apply_filter":
+        key = transformation_key(post_id, "apply_filter", {"effect": spec.effect.value, "value": spec.value})
+        url = await transform_service.apply_filter(image_url, f"{spec.effect.value}:{spec.value}")
+    else:
+        key = transformation_key(post_id, "reduce_size", {"quality": spec.quality.value, "format": spec.format.value})
+        url = await transform_service.change_format_and_quality(image_url, spec.quality.value, spec.format.value)
+    return key, url
+
 
 @router.post("/resize", response_model=TransformResponseImageSchema, status_code=status.HTTP_201_CREATED)
 async def resize(
@@ -26,7 +65,7 @@ async def resize(
     height: int,
     crop: CloudinaryCropEnum,
 
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
     db: AsyncSession = Depends(get_db),
 ):
     post = await get_post(post_id, db)
@@ -34,11 +73,9 @@ async def resize(
         log.error(f"Post with id {post_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="post not found")
     image_url = post.image_url
-    transformed_url = await cloudinary_service.resize(image_url, width, height, crop.value)
-    transformed_image_in_db = await get_by_url(transformed_url, db)
-    if transformed_image_in_db:
-        return transformed_image_in_db
-    transformed_image = await save_ti(user.id, post_id, transformed_url, db)
+    transformed_url = await transform_service.resize(image_url, width, height, crop.value)
+    key = transformation_key(post_id, "resize", {"width": width, "height": height, "crop": crop.value})
+    transformed_image = await upsert_ti(user.id, post_id, key, transformed_url, db)
     return transformed_image
 
 @router.post("/apply_filter", response_model=TransformResponseImageSchema, status_code=status.HTTP_201_CREATED)
@@ -46,40 +83,20 @@ async def apply_filter(
     post_id: UUID,
     effect: CloudinaryEffectEnum,
     value: int,
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
     db: AsyncSession = Depends(get_db),
 ):
     post = await get_post(post_id, db)
     if not post:
         log.error(f"Post with id {post_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="post not found")
-    limits = {
-        "blur": (1, 200),
-        "pixelate": (1, 200),
-        "oil_paint": (1, 100),
-        "brightness": (-99, 100),
-        "contrast": (-100, 100),
-        "saturation": (-100, 100),
-        "hue": (0, 360),
-        "gamma": (0.01, 9.99),
-        "sharpen": (1, 100),
-        "vignette": (1, 100),
-    }
-    min_val, max_val = limits.get(effect.value, (None, None))
-
-    if min_val is not None and not (min_val <= value <= max_val):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Effect '{effect.value}' must be in range [{min_val}, {max_val}].",
-        )
+    _check_filter_value(effect, value)
 
     effect_string = f"{effect.value}:{value}"
     image_url = post.image_url
-    transformed_url = await cloudinary_service.apply_filter(image_url, effect_string)
-    transformed_image_in_db = await get_by_url(transformed_url, db)
-    if transformed_image_in_db:
-        return transformed_image_in_db
-    transformed_image = await save_ti(user.id, post_id, transformed_url, db)
+    transformed_url = await transform_service.apply_filter(image_url, effect_string)
+    key = transformation_key(post_id, "apply_filter", {"effect": effect.value, "value": value})
+    transformed_image = await upsert_ti(user.id, post_id, key, transformed_url, db)
     return transformed_image
 
 @router.post("/reduce_size", response_model=TransformResponseImageSchema, status_code=status.HTTP_201_CREATED)
@@ -87,7 +104,7 @@ async def reduce_size(
     post_id: UUID,
     quality: CloudinaryQualityEnum,
     format: CloudinaryFormatEnum,
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
     db: AsyncSession = Depends(get_db),
 ):
     post = await get_post(post_id, db)
@@ -95,16 +112,47 @@ async def reduce_size(
         log.error(f"Post with id {post_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="post not found")
     image_url = post.image_url
-    transformed_url = await cloudinary_service.change_format_and_quality(image_url, quality.value, format.value)
-    transformed_image_in_db = await get_by_url(transformed_url, db)
-    if transformed_image_in_db:
-        return transformed_image_in_db
-    transformed_image = await save_ti(user.id, post_id, transformed_url, db)
+    transformed_url = await transform_service.change_format_and_quality(image_url, quality.value, format.value)
+    key = transformation_key(post_id, "reduce_size", {"quality": quality.value, "format": format.value})
+    transformed_image = await upsert_ti(user.id, post_id, key, transformed_url, db)
     return transformed_image
 
 
+@router.post("/batch", response_model=BatchTransformResponseSchema, status_code=status.HTTP_201_CREATED)
+async def batch_transform(
+    body: BatchTransformRequestSchema,
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
+    db: AsyncSession = Depends(get_db),
+):
+    post_ids = list(dict.fromkeys(body.post_ids))
+    for spec in body.transformations:
+        if spec.operation == "apply_filter":
+            _check_filter_value(spec.effect, spec.value)
+
+    image_urls = await get_post_image_urls(post_ids, db)
+    missing = [str(post_id) for post_id in post_ids if post_id not in image_urls]
+    if missing:
+        log.error(f"Posts not found: {missing}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"posts not found: {', '.join(missing)}")
+
+    # Уся матриця post × transformation обчислюється конкурентно
+    cells = [(post_id, spec) for post_id in post_ids for spec in body.transformations]
+    results = await asyncio.gather(*(_transform(post_id, image_urls[post_id], spec) for post_id, spec in cells))
+
+    images = await upsert_many_ti(
+        user.id, [(post_id, key, url) for (post_id, _), (key, url) in zip(cells, results)], db
+    )
+    width = len(body.transformations)
+    return {
+        "items": [
+            {"post_id": post_id, "images": [images[key] for key, _ in results[row * width:(row + 1) * width]]}
+            for row, post_id in enumerate(post_ids)
+        ]
+    }
+
+
 @router.get("/user_transformed_images", response_model=list[TransformResponseImageSchema])
-async def get_transformed_images_for_user(user: User = Depends(auth_service.authenticate_user), db: AsyncSession = Depends(get_db)):
+async def get_transformed_images_for_user(user: UserSnapshotSchema = Depends(auth_service.authenticate_user), db: AsyncSession = Depends(get_db)):
     user_id = user.id
     images = await get_all_for_user(user_id, db)
     if not images:
@@ -122,7 +170,7 @@ async def get_transformed_image(id: UUID, db: AsyncSession = Depends(get_db)):
 @router.delete("/transformed_image/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transformed_image(
     id: UUID,
-    user: User = Depends(admin_moderator_roles_access),
+    user: UserSnapshotSchema = Depends(admin_moderator_roles_access),
     db: AsyncSession = Depends(get_db),
 ):
     transformed_image = await get_ti(id, db)
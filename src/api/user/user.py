@@ -6,10 +6,10 @@ from uuid import UUID
 from pydantic import EmailStr
 
 from src.db.database import get_db
-from src.models.users import User, Gender
+from src.models.users import Gender
 from src.models.posts import Post
 from src.services.auth import auth_service
-from src.schemas.user import UserProfileSchema, UpdateUserProfileSchema, UserMeSchema
+from src.schemas.user import UserProfileSchema, UpdateUserProfileSchema, UserMeSchema, UserSnapshotSchema
 from src.services.roles import RoleAccessService, Role
 from src.repository.posts import count_user_photos
 from src.repository.user import update_user_profile, get_user_by_email, ban_user, get_user_by_id
@@ -19,9 +19,14 @@ router_admin_moderator_work_with_user = APIRouter(prefix="/users", tags=["admin"
 
 @router.get("/me", response_model=UserMeSchema, status_code=status.HTTP_200_OK)
 async def get_profile(
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    return user
+    # Кеш автентифікації містить лише знімок, повний профіль читаємо з БД
+    profile = await get_user_by_id(user.id, db)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return profile
 
 @router.get("/{email}", response_model=UserProfileSchema, status_code=status.HTTP_200_OK)
 async def get_user_profile(email: EmailStr, db: AsyncSession = Depends(get_db)):
@@ -48,12 +53,15 @@ async def update_profile(
     age: Optional[int] = None,
     gender: Optional[Gender] = None,
     password: Optional[str] = None,
-    user: User = Depends(auth_service.authenticate_user),
+    user: UserSnapshotSchema = Depends(auth_service.authenticate_user),
     db: AsyncSession = Depends(get_db),
 ):
     if not any([full_name, age, gender, password]):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one field must be provided.")
-    return await update_user_profile(user, full_name, age, gender, password, db)
+    profile = await get_user_by_id(user.id, db)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return await update_user_profile(profile, full_name, age, gender, password, db)
 
 
 @router_admin_moderator_work_with_user.patch("/ban/{user_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(RoleAccessService([Role.admin]))])
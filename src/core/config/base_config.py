@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
@@ -12,6 +13,8 @@ ERROR_LOG_FILE = LOGS_DIR / 'error.log'
 WARNING_LOG_FILE = LOGS_DIR / 'warning.log' 
 DEBUG_LOG_FILE = LOGS_DIR / 'debug.log'
 
+MEDIA_DIR = BASE_DIR / 'media'
+
 # pydantic from .env
 class Settings(BaseSettings):
     model_config = ConfigDict(
@@ -29,12 +32,24 @@ class Settings(BaseSettings):
 class AppConfig(Settings):
     DEBUG: bool = False
 
+class LogConfig(Settings):
+    LOG_FORMAT: Literal["text", "json"] = "text"  # json — один JSON-об'єкт на рядок
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0  # частка DEBUG-записів, що потрапляють у лог
+    LOG_QUEUE_SIZE: int = 10000  # при переповненні записи відкидаються, а не блокують цикл подій
+
 class StartAppConfig(Settings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
 
-app_config = AppConfig()
-start_app_config = StartAppConfig()
+class BaseAppSettings(AppConfig, LogConfig, StartAppConfig):
+    pass
+
+
+# Нужны логгеру до загрузки остальной конфигурации, поэтому отдельный объект
+base_settings = BaseAppSettings()
+app_config = base_settings
+log_config = base_settings
+start_app_config = base_settings
 
 
 
@@ -1,18 +1,14 @@
 import os
 import json
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import EmailStr, field_validator
 
 from src.core.config.base_config import Settings
 from src.models.users import Gender
 from src.core.logger.logger import logger
-from src.core.config.base_config import BASE_DIR
-
-logger.debug(f"BASE_DIR: {BASE_DIR}")
 
 # Определяем среду выполнения (используем более надежный способ)
 is_docker = os.path.exists("/.dockerenv")
-print(f"Определена среда: {'Docker' if is_docker else 'Локальная'}")
 
 class DBConfig(Settings):
     POSTGRES_USER: str = "postgres"
@@ -20,6 +16,13 @@ class DBConfig(Settings):
     POSTGRES_DB: str = "alphadb"
     POSTGRES_HOST: str = "db"  # Будет переопределено позже
     POSTGRES_PORT: int = 5432
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     @property
     def DATABASE_URL(self) -> str:
@@ -32,11 +35,16 @@ class DBConfig(Settings):
 class JWTConfig(Settings):
     SECRET_KEY: str = "1234567890"
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # access-токени не відкликаються, тож строк короткий
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     EMAIL_TOKEN_EXPIRE_DAYS: int = 7
 
 
+class PasswordConfig(Settings):
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+
 class AdminConfig(Settings):
     ADMIN_PASSWORD: str = "admin"
     ADMIN_FULLNAME: str = "Admin User Ampss"
@@ -50,24 +58,83 @@ class RedisConfig(Settings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
 
+class CacheConfig(Settings):
+    USER_CACHE_TTL: int = 900  # Redis, секунди
+    USER_CACHE_LOCAL_TTL: int = 30  # in-process, секунди
+    USER_CACHE_LOCAL_SIZE: int = 1024
+    QR_CACHE_LOCAL_SIZE: int = 512
+    QR_CACHE_TTL: int = 86400
+    QR_CACHE_REDIS: bool = False
+    POST_CACHE_TTL: int = 300
+    POST_CACHE_LOCK_TTL_MS: int = 5000
+    POST_CACHE_LOCK_WAIT: float = 2.0
+    TAG_SUGGEST_CAPACITY: int = 10000
+    TAG_SUGGEST_REFRESH: int = 300
+    TOKEN_CACHE_SIZE: int = 10000
+
+class SearchConfig(Settings):
+    # Ранжуються лише найновіші N збігів: частий термін не перетворюється на ранжування всієї таблиці
+    SEARCH_CANDIDATE_LIMIT: int = 1000
+
+class RateLimitConfig(Settings):
+    RATE_LIMIT_ENABLED: bool = True
+    # Політика: "<запитів>/<секунд>"; ключ — ім'я політики в RateLimit(...)
+    RATE_LIMIT_POLICIES: dict[str, str] = {
+        "posts:read": "10/20",
+        "posts:write": "10/20",
+        "tags:read": "10/20",
+        "tags:suggest": "60/20",
+        "tags:write": "10/20",
+    }
+    RATE_LIMIT_LOCAL_LEASE: int = 5  # скільки запитів воркер резервує за один виклик Redis
+    RATE_LIMIT_LOCAL_SIZE: int = 10000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # брати IP з X-Forwarded-For (лише за довіреним проксі)
+
 class CloudinaryConfig(Settings):
     CLOUDINARY_NAME: str = "your_cloud_name"
     CLOUDINARY_API_KEY: int = 1234567890
     CLOUDINARY_API_SECRET: str = "your_api_secret"
+    CLOUDINARY_API_URL: str = "https://api.cloudinary.com/v1_1"  # можна підмінити локальним сервером
+    CLOUDINARY_MAX_CONNECTIONS: int = 20
+    CLOUDINARY_UPLOAD_CONCURRENCY: int = 10
+    CLOUDINARY_TIMEOUT: float = 60.0
+    CLOUDINARY_MAX_RETRIES: int = 3
+    CLOUDINARY_RETRY_BACKOFF: float = 0.5
+
+
+class TransformConfig(Settings):
+    IMAGE_TRANSFORM_BACKEND: Literal["cloudinary", "local"] = "cloudinary"
+    LOCAL_MEDIA_BASE_URL: str = "http://localhost:8000/media"
+    IMAGE_TRANSFORM_WORKERS: int = 2
+
+
+class AppSettings(
+    AdminConfig, DBConfig, JWTConfig, PasswordConfig, RedisConfig, CacheConfig, SearchConfig, RateLimitConfig, CloudinaryConfig,
+    TransformConfig,
+):
+    pass
 
 
-# Инициализация объектов конфигурации
-admin_config = AdminConfig()
-db_config = DBConfig()
-jwt_config = JWTConfig()
-redis_config = RedisConfig()
-cloudinary_config = CloudinaryConfig()
+# .env читается один раз; секции остаются псевдонимами одного объекта
+settings = AppSettings()
+admin_config = settings
+db_config = settings
+jwt_config = settings
+password_config = settings
+redis_config = settings
+cache_config = settings
+search_config = settings
+rate_limit_config = settings
+cloudinary_config = settings
+transform_config = settings
 
 # Настройка в зависимости от среды ПОСЛЕ инициализации объектов
 if not is_docker:
     # Для локальной разработки
-    db_config.POSTGRES_HOST = "localhost"
-    redis_config.REDIS_HOST = "172.23.6.211"  # IP-адрес WSL2
-    print(f"Локальная конфигурация: POSTGRES_HOST={db_config.POSTGRES_HOST}, REDIS_HOST={redis_config.REDIS_HOST}")
+    settings.POSTGRES_HOST = "localhost"
+    settings.REDIS_HOST = "172.23.6.211"  # IP-адрес WSL2
 
-print(f"DBConfig: {db_config.DATABASE_URL}")
\ No newline at end of file
+logger.debug(
+    f"Среда: {'Docker' if is_docker else 'Локальная'}, "
+    f"POSTGRES_HOST={settings.POSTGRES_HOST}, REDIS_HOST={settings.REDIS_HOST}"
+)
@@ -1,7 +1,16 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
-from src.core.config.base_config import app_config, INFO_LOG_FILE, ERROR_LOG_FILE, WARNING_LOG_FILE, DEBUG_LOG_FILE, LOGS_DIR
+import queue
+import random
+import threading
+from datetime import datetime, timezone
 
+from src.core.config.base_config import app_config, log_config, INFO_LOG_FILE, ERROR_LOG_FILE, WARNING_LOG_FILE, DEBUG_LOG_FILE, LOGS_DIR
+from src.core.metrics import log_records_dropped_total
 
 
 class ErrorTypeFilter(logging.Filter):
@@ -12,6 +21,104 @@ class ErrorTypeFilter(logging.Filter):
     def filter(self, record):
         return record.levelname in self.allowed_levels
 
+
+class DebugSamplingFilter(logging.Filter):
+    # Пропускает лишь долю DEBUG-записей, остальные уровни не трогает
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno != logging.DEBUG or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    # Никогда не блокирует цикл событий: при полной очереди запись отбрасывается и считается
+    dropped = 0
+
+    def prepare(self, record):
+        # Форматирование остаётся за хендлерами listener-а, traceback сериализуем сразу
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped_total.inc(level=record.levelname)
+
+
+class FlushRequest:
+    # Маркер в очереди: listener сбрасывает хендлеры, когда дойдёт до него
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class LogListener(logging.handlers.QueueListener):
+    # Хендлеры с файловым I/O работают в фоновом потоке
+    def __init__(self, log_queue, *handlers):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self._stop_lock = threading.Lock()
+
+    def enqueue_sentinel(self):
+        # Блокирующий put: сигнал остановки не должен потеряться при полной очереди
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        if isinstance(record, FlushRequest):
+            self.flush_handlers()
+            record.done.set()
+            return
+        super().handle(record)
+
+    def flush_handlers(self):
+        # Потоки хендлеров при завершении процесса могут быть уже закрыты, как в logging.shutdown
+        for handler in self.handlers:
+            try:
+                handler.acquire()
+                try:
+                    handler.flush()
+                finally:
+                    handler.release()
+            except (OSError, ValueError):
+                pass
+
+    def flush(self, timeout: float | None = None) -> bool:
+        # Ждёт, пока listener запишет всё, что было в очереди до вызова; поток не перезапускается
+        if self._thread is None:
+            self.flush_handlers()
+            return True
+        request = FlushRequest()
+        self.queue.put(request)
+        return request.done.wait(timeout)
+
+    def stop(self):
+        # Дожидается записи всего буфера; повторный вызов безопасен
+        with self._stop_lock:
+            if self._thread is not None:
+                super().stop()
+                self.flush_handlers()
+
+
 def setup_logger():
     os.makedirs(LOGS_DIR, exist_ok=True)
     logger = logging.getLogger("backend_app_logger")
@@ -21,7 +128,10 @@ def setup_logger():
         logger.setLevel(logging.INFO)
 
     # Формат логов
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if log_config.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     # Логирование в файл для обычных сообщений (информация)
     info_file_handler = logging.FileHandler(INFO_LOG_FILE, encoding='utf-8')
@@ -52,16 +162,40 @@ def setup_logger():
     debug_file_handler.setFormatter(formatter)
     debug_file_handler.addFilter(ErrorTypeFilter(["DEBUG"]))
 
-    # Добавление хендлеров
-    logger.addHandler(info_file_handler)
-    logger.addHandler(error_file_handler)
-    logger.addHandler(warning_file_handler)
-    logger.addHandler(console_handler)
+    handlers = [info_file_handler, error_file_handler, warning_file_handler, console_handler]
     # Если отладка включена, добавляем обработчик для debug логов
     if app_config.DEBUG:
-        logger.addHandler(debug_file_handler)
+        handlers.append(debug_file_handler)
+
+    # Логгер пишет только в ограниченную очередь, хендлеры обслуживает listener
+    log_queue = queue.Queue(maxsize=log_config.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    if log_config.LOG_DEBUG_SAMPLE_RATE < 1.0:
+        queue_handler.addFilter(DebugSamplingFilter(log_config.LOG_DEBUG_SAMPLE_RATE))
+    logger.addHandler(queue_handler)
+
+    listener = LogListener(log_queue, *handlers)
+    listener.start()
+    return logger, queue_handler, listener
+
+
+def route_to_queue(name: str, level: int = logging.INFO):
+    # Сторонние логгеры (например, SQL echo) пишут через ту же очередь
+    external = logging.getLogger(name)
+    external.setLevel(level)
+    if queue_handler not in external.handlers:
+        external.addHandler(queue_handler)
+
+
+def flush_logs(timeout: float = 5.0):
+    # Дописывает буфер; listener продолжает работать, поэтому логи после lifespan тоже не теряются
+    listener.flush(timeout)
+
+
+def shutdown_logger():
+    listener.stop()
 
-    return logger
 
 # Создаем логгер
-logger = setup_logger()
+logger, queue_handler, listener = setup_logger()
+atexit.register(shutdown_logger)
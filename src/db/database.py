@@ -1,20 +1,92 @@
 import contextlib
+import time
 
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core import log, config
+from src.core.logger.logger import route_to_queue
+from src.core.metrics import registry, Gauge
+from src.db import query_stats
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # Рахуємо лише ті видачі з'єднань, які справді чекали на вільне місце в пулі
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw):
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+        self.limit_overflow = max_overflow
+        self.wait_count = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.timeouts = 0
+
+    def _must_wait(self) -> bool:
+        # Вільних з'єднань немає, а нові відкривати вже не можна
+        return self.limit_overflow > -1 and self.checkedin() == 0 and self.overflow() >= self.limit_overflow
+
+    def _do_get(self):
+        if not self._must_wait():
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.wait_count += 1
+            self.wait_time += elapsed
+            self.max_wait_time = max(self.max_wait_time, elapsed)
 
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url, echo=True)
+    def __init__(self, url: str, db_config: config.DBConfig):
+        self._max_overflow = db_config.DB_MAX_OVERFLOW
+        self._engine: AsyncEngine | None = create_async_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=db_config.DB_POOL_SIZE,
+            max_overflow=db_config.DB_MAX_OVERFLOW,
+            pool_timeout=db_config.DB_POOL_TIMEOUT,
+            pool_recycle=db_config.DB_POOL_RECYCLE,
+            pool_pre_ping=db_config.DB_POOL_PRE_PING,
+            connect_args={"prepared_statement_cache_size": db_config.DB_STATEMENT_CACHE_SIZE},
+        )
         self._session_maker: async_sessionmaker = async_sessionmaker(
             autoflush=False, autocommit=False, bind=self._engine, expire_on_commit=False
         )
+        query_stats.install(self._engine)
+        if db_config.DB_ECHO:
+            # echo=True писав би у stdout синхронно; SQL іде через чергу логера
+            route_to_queue("sqlalchemy.engine")
+
+    @property
+    def engine(self) -> AsyncEngine | None:
+        return self._engine
+
+    def pool_stats(self) -> dict:
+        pool = self._engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "wait_count": pool.wait_count,
+            "wait_time_total": pool.wait_time,
+            "wait_time_max": pool.max_wait_time,
+            "timeouts": pool.timeouts,
+        }
+
+    async def close(self):
+        if self._engine is not None:
+            await self._engine.dispose()
 
     @contextlib.asynccontextmanager
     async def session(self):
@@ -31,9 +103,19 @@ class DatabaseSessionManager:
             await session.close()
 
 
-sessionmanager = DatabaseSessionManager(config.db_config.DATABASE_URL)
+sessionmanager = DatabaseSessionManager(config.db_config.DATABASE_URL, config.db_config)
+
+
+def collect_pool_metrics():
+    gauge = Gauge("db_pool", "SQLAlchemy connection pool state", ("stat",))
+    for stat, value in sessionmanager.pool_stats().items():
+        gauge.set(value, stat=stat)
+    return [gauge]
+
+
+registry.register_collector(collect_pool_metrics)
 
 
 async def get_db():
     async with sessionmanager.session() as session:
-        yield session
\ No newline at end of file
+        yield session
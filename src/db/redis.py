@@ -1,11 +1,23 @@
 from redis.asyncio import Redis
 import contextlib
+import time
 from src.core import config, log
+from src.core.metrics import redis_command_duration_seconds
+
+
+class InstrumentedRedis(Redis):
+    # Час виконання кожної команди Redis для /metrics
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started, command=str(args[0]).upper())
 
 
 class RedisSessionManager:
     def __init__(self, host: str, port: int, db: int, password: str | None = None):
-        self._redis_client = Redis(
+        self._redis_client = InstrumentedRedis(
             host=host,
             port=port,
             db=db,
@@ -1,8 +1,8 @@
 
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, func, text
+from sqlalchemy import CheckConstraint, FetchedValue, Numeric, String, Integer, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from src.db.base import Base
@@ -13,16 +13,38 @@ if TYPE_CHECKING:
     from src.models.transformed_images import TransformedImage
     from src.models.users import User
 
+MAX_TAGS_CONSTRAINT = "ck_posts_tag_count_max_five"
+SEARCH_CONFIG = "simple"
+
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        CheckConstraint("tag_count <= 5", name=MAX_TAGS_CONSTRAINT),
+        Index("ix_posts_rating_top", text("rating_avg DESC"), text("rating_count DESC"), text("id DESC")),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
     image_url: Mapped[str] = mapped_column(String, nullable=False)
+    # Підтримується тригером на post_tags, ліміт у 5 тегів перевіряє CHECK
+    tag_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    # Агрегати рейтингу, включно з середнім, підтримуються тригером на post_ratings
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    rating_avg: Mapped[float] = mapped_column(Numeric(3, 2, asdecimal=False), nullable=False, server_default=text("0"))
+    # Повнотекстовий індекс по заголовку (вага A) та опису (вага B), заповнює тригер posts_search_vector
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
@@ -45,6 +67,9 @@ class Post(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
@@ -61,6 +86,9 @@ class Comment(Base):
 
 class PostRating(Base):
     __tablename__ = "post_ratings"
+    __table_args__ = (
+        Index("uq_post_ratings_user_id_post_id", "user_id", "post_id", unique=True),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
@@ -73,6 +101,10 @@ class PostRating(Base):
 
 class PostTag(Base):
     __tablename__ = "post_tags"
+    __table_args__ = (
+        Index("uq_post_tags_post_id_tag_id", "post_id", "tag_id", unique=True),
+        Index("ix_post_tags_tag_id", "tag_id"),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
@@ -85,6 +117,9 @@ class PostTag(Base):
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        Index("ix_tags_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
     )
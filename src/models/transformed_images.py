@@ -1,6 +1,6 @@
 from httpx import post
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import String, ForeignKey, DateTime, func, text
+from sqlalchemy import String, ForeignKey, DateTime, Index, func, text
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from datetime import datetime
 
@@ -14,6 +14,11 @@ if TYPE_CHECKING:
 
 class TransformedImage(Base):
     __tablename__ = "transformed_images"
+    __table_args__ = (
+        Index("ix_transformed_images_url", "url"),
+        Index("ix_transformed_images_user_id", "user_id"),
+        Index("uq_transformed_images_transformation_key", "transformation_key", unique=True),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
@@ -31,14 +36,18 @@ class TransformedImage(Base):
         String, nullable=False
     )  # URL трансформованого зображення
 
+    transformation_key: Mapped[str] = mapped_column(
+        String(64), nullable=False
+    )  # sha256 канонічного опису (post_id, operation, params) для дедуплікації
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now()
     )  # Дата створення запису
 
     user: Mapped["User"] = relationship(
-        "User", back_populates="transformed_images", lazy="joined"
+        "User", back_populates="transformed_images", lazy="select"
     )
 
     post: Mapped["Post"] = relationship(
-        "Post", back_populates="transformed_images", lazy="joined"
+        "Post", back_populates="transformed_images", lazy="select"
     )  # Відношення до моделі Post
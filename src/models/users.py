@@ -54,7 +54,7 @@ class User(Base):
     )
 
     posts: Mapped[list["Post"]] = relationship(
-        "Post", back_populates="user", lazy="joined"
+        "Post", back_populates="user", lazy="select"
     )
 
     is_active: Mapped[bool] = mapped_column(
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy import tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.posts import Comment
 from uuid import UUID
@@ -20,6 +23,34 @@ async def get_comments(post_id: UUID, db: AsyncSession):
     return coments.scalars().all()
 
 
+async def get_comments_after(post_id: UUID, limit: int, after: Optional[tuple[datetime, UUID]], db: AsyncSession):
+    # Keyset-пагінація по індексу (post_id, created_at, id)
+    stmt = (
+        select(Comment)
+        .filter(Comment.post_id == post_id)
+        .order_by(Comment.created_at, Comment.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.filter(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+    result = await db.execute(stmt)
+    comments = list(result.scalars().all())
+    return comments[:limit], len(comments) > limit
+
+
+async def stream_comments(post_id: UUID, db: AsyncSession, batch_size: int = 500) -> AsyncIterator[Comment]:
+    # Server-side курсор: у пам'яті лише одна партія рядків
+    stmt = (
+        select(Comment)
+        .filter(Comment.post_id == post_id)
+        .order_by(Comment.created_at, Comment.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream_scalars(stmt)
+    async for comment in result:
+        yield comment
+
+
 async def update_comment(comment_id: UUID, message: str, db: AsyncSession):
     comment = await db.get(Comment, comment_id)
     if comment:
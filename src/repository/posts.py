@@ -1,30 +1,77 @@
+from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import UUID, func, select, delete
+from sqlalchemy import UUID, func, select, delete, insert, literal_column, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
+from src.core import config
 from src.models import Post, User, TransformedImage
-from src.models.posts import PostTag, Tag
-from src.repository.tags import add_tag
+from src.models.posts import PostTag, Tag, SEARCH_CONFIG
+from src.repository.tags import add_tag, get_tag_names_for_post, upsert_tags
+from src.services.post_cache import post_cache
+from src.services.tag_suggest import tag_suggester
 
+# Профілі завантаження: кожен запит явно вказує потрібні зв'язки
+POST_DETAIL = (joinedload(Post.tags).joinedload(PostTag.tag),)
+POST_LIST = (selectinload(Post.tags).selectinload(PostTag.tag),)
 
 async def get_posts(limit: int, offset: int, db: AsyncSession):
+    # selectinload, щоб LIMIT обмежував пости, а не рядки join-у з тегами
     result = await db.execute(
         select(Post)
-        .options(
-            joinedload(Post.tags).joinedload(PostTag.tag)
-        )
+        .options(*POST_LIST)
+        .order_by(Post.created_at.desc(), Post.id.desc())
         .offset(offset).limit(limit)
     )
-    return result.scalars().unique().all()
+    return result.scalars().all()
+
+
+async def get_posts_after(limit: int, after: Optional[tuple[datetime, UUID]], db: AsyncSession):
+    # Keyset-пагінація по індексу (created_at, id): вартість не залежить від глибини сторінки
+    stmt = (
+        select(Post)
+        .options(*POST_LIST)
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(*after))
+    result = await db.execute(stmt)
+    posts = list(result.scalars().all())
+    has_more = len(posts) > limit
+    return posts[:limit], has_more
+
+
+async def search_posts(query: str, limit: int, after: Optional[tuple[float, UUID]], db: AsyncSession):
+    # Кандидати — найновіші SEARCH_CANDIDATE_LIMIT збігів по GIN-індексу search_vector;
+    # ts_rank_cd рахується лише для них, keyset по (rank, id)
+    ts_query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query)
+    candidates = (
+        select(Post.id)
+        .where(Post.search_vector.op("@@")(ts_query))
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(config.search_config.SEARCH_CANDIDATE_LIMIT)
+        .subquery()
+    )
+    rank = func.ts_rank_cd(Post.search_vector, ts_query)
+    stmt = (
+        select(Post, rank.label("rank"))
+        .join(candidates, candidates.c.id == Post.id)
+        .options(*POST_LIST)
+        .order_by(rank.desc(), Post.id.desc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(rank, Post.id) < tuple_(*after))
+    result = await db.execute(stmt)
+    rows = list(result.all())
+    return rows[:limit], len(rows) > limit
 
 
 async def get_post(post_id: UUID, db: AsyncSession):
     result = await db.execute(
         select(Post)
-        .options(
-            joinedload(Post.tags).joinedload(PostTag.tag)
-        )
+        .options(*POST_DETAIL)
         .where(Post.id == post_id)
     )
     post = result.unique().scalar_one_or_none()
@@ -32,14 +79,18 @@ async def get_post(post_id: UUID, db: AsyncSession):
     
 
 
+async def get_post_image_urls(post_ids: List[UUID], db: AsyncSession) -> dict:
+    # Лише id та image_url: для пакетних трансформацій теги не потрібні
+    result = await db.execute(select(Post.id, Post.image_url).where(Post.id.in_(post_ids)))
+    return {post_id: image_url for post_id, image_url in result.all()}
+
+
 async def get_posts_by_tag(tag_name: str, db: AsyncSession):
     result = await db.execute(
         select(Post)
         .join(Post.tags)
         .join(PostTag.tag)
-        .options(
-            selectinload(Post.tags).selectinload(PostTag.tag)  
-        )
+        .options(*POST_LIST)
         .where(Tag.name == tag_name)
     )
     return result.unique().scalars().all()
@@ -52,6 +103,8 @@ async def add_tag_for_post(post_id: UUID, name: str, db: AsyncSession):
     db.add(post_tag)
     await db.commit()
     await db.refresh(post_tag)
+    tag_suggester.add(name)
+    await post_cache.invalidate(post_id, await get_tag_names_for_post(post_id, db))
 
 
 async def delete_transformed_images_by_post_id(post_id: UUID, db: AsyncSession):
@@ -63,7 +116,8 @@ async def delete_transformed_images_by_post_id(post_id: UUID, db: AsyncSession):
 
 
 #create post
-async def create_post(title: str, description: str, image_url: str, user_id: UUID, db: AsyncSession):
+async def create_post(title: str, description: str, image_url: str, user_id: UUID, db: AsyncSession,
+                      tags: Optional[List[str]] = None):
     
     post = Post(
         title=title,
@@ -73,8 +127,19 @@ async def create_post(title: str, description: str, image_url: str, user_id: UUI
     )
 
     db.add(post)
+    # Пост і всі його теги створюються в одній транзакції з одним commit
+    await db.flush()
+    tag_ids = await upsert_tags(tags or [], db)
+    if tag_ids:
+        await db.execute(
+            insert(PostTag).values([{"post_id": post.id, "tag_id": tag_id} for tag_id in tag_ids.values()])
+        )
     await db.commit()
+    # Локальний індекс підказок бачить лише теги, що вже в базі
+    for name in tag_ids:
+        tag_suggester.add(name)
     await db.refresh(post)
+    await post_cache.invalidate(tag_names=tag_ids.keys())
 
     return post 
 
@@ -93,6 +158,7 @@ async def update_post(title, description, post_id: UUID, db: AsyncSession):
             post.description = description
         await db.commit()
         await db.refresh(post)
+        await post_cache.invalidate(post_id, await get_tag_names_for_post(post_id, db))
     return post
 
 # delete post
@@ -102,8 +168,10 @@ async def delete_post(post_id: UUID, db: AsyncSession):
     post = await db.execute(stmt)
     post = post.scalar_one_or_none()
     if post:
+        tag_names = await get_tag_names_for_post(post_id, db)
         await db.delete(post)
         await db.commit()
+        await post_cache.invalidate(post_id, tag_names)
     return post
 
 async def count_user_photos(user_id: UUID, db: AsyncSession) -> int:
@@ -0,0 +1,44 @@
+from sqlalchemy import UUID, select, delete, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.posts import Post, PostRating
+from src.repository.posts import POST_LIST
+
+
+async def rate_post(post_id: UUID, user_id: UUID, rating: int, db: AsyncSession):
+    # Повторна оцінка оновлює голос; агрегати в posts оновлює тригер
+    stmt = (
+        insert(PostRating)
+        .values(post_id=post_id, user_id=user_id, rating=rating)
+        .on_conflict_do_update(index_elements=[PostRating.user_id, PostRating.post_id], set_={"rating": rating})
+    )
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def unrate_post(post_id: UUID, user_id: UUID, db: AsyncSession) -> bool:
+    result = await db.execute(
+        delete(PostRating).where(and_(PostRating.post_id == post_id, PostRating.user_id == user_id))
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def get_rating_summary(post_id: UUID, db: AsyncSession):
+    result = await db.execute(
+        select(Post.id, Post.rating_count, Post.rating_avg).where(Post.id == post_id)
+    )
+    return result.one_or_none()
+
+
+async def get_top_rated(limit: int, db: AsyncSession):
+    # Читання з індексу ix_posts_rating_top, без агрегації
+    result = await db.execute(
+        select(Post)
+        .options(*POST_LIST)
+        .where(Post.rating_count > 0)
+        .order_by(Post.rating_avg.desc(), Post.rating_count.desc(), Post.id.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
@@ -1,11 +1,12 @@
 from typing import List
-from sqlalchemy import UUID, select
+from sqlalchemy import UUID, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
 
 from src.models import Tag, Post
 from src.models.posts import PostTag
-
+from src.services.post_cache import post_cache
 
 
 async def get_tag_by_name(tag_name: str, db: AsyncSession):
@@ -24,6 +25,38 @@ async def get_tags_for_post(post_id: UUID, db: AsyncSession):
     return tags
 
 
+async def get_tag_names_for_post(post_id: UUID, db: AsyncSession) -> list[str]:
+    result = await db.execute(
+        select(Tag.name)
+        .join(PostTag)
+        .where(PostTag.post_id == post_id)
+    )
+    return list(result.scalars().all())
+
+
+async def get_popular_tag_names(limit: int, db: AsyncSession) -> list[str]:
+    result = await db.execute(
+        select(Tag.name)
+        .outerjoin(PostTag, PostTag.tag_id == Tag.id)
+        .group_by(Tag.id)
+        .order_by(func.count(PostTag.id).desc(), Tag.name)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def suggest_tags(prefix: str, limit: int, db: AsyncSession) -> list[str]:
+    # ILIKE 'prefix%' обслуговується trigram GIN-індексом на tags.name
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    result = await db.execute(
+        select(Tag.name)
+        .where(Tag.name.ilike(f"{escaped}%", escape="\\"))
+        .order_by(Tag.name)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
 async def add_tag(name : str, db: AsyncSession):
 
     stmt = select(Tag).where(Tag.name == name)
@@ -37,11 +70,31 @@ async def add_tag(name : str, db: AsyncSession):
     
     return tag.id
 
+async def upsert_tags(names: list[str], db: AsyncSession) -> dict[str, UUID]:
+    # Один INSERT ... ON CONFLICT DO NOTHING на всі теги; сортування прибирає дедлоки між паралельними вставками
+    names = sorted(set(names))
+    if not names:
+        return {}
+    result = await db.execute(
+        insert(Tag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[Tag.name])
+        .returning(Tag.name, Tag.id)
+    )
+    tag_ids = {name: tag_id for name, tag_id in result.all()}
+    existing = [name for name in names if name not in tag_ids]
+    if existing:
+        result = await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(existing)))
+        tag_ids.update({name: tag_id for name, tag_id in result.all()})
+    return tag_ids
+
 async def delete_tag_from_post(tag: Tag, post: Post, db: AsyncSession):
     stmt = select(PostTag).where(and_(PostTag.tag_id == tag.id, PostTag.post_id == post.id))
     tag = await db.execute(stmt)
     tag = tag.scalar_one_or_none()
     if tag:
+        tag_names = await get_tag_names_for_post(post.id, db)
         await db.delete(tag)
         await db.commit()
+        await post_cache.invalidate(post.id, tag_names)
 
@@ -1,45 +1,62 @@
+from sqlalchemy import union_all
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload
 from src.models.transformed_images import TransformedImage
 
 from uuid import UUID
 
-from src.services import image
-
 async def get_all_for_user(user_id: UUID, db: AsyncSession):
-    stmt = select(TransformedImage).options(joinedload(TransformedImage.user)).filter(
+    stmt = select(TransformedImage).filter(
         TransformedImage.user_id == user_id
     )
     result = await db.execute(stmt)
 
-    return result.unique().scalars().all()
+    return result.scalars().all()
 
 async def get(image_id: UUID, db: AsyncSession):
-    stmt = select(TransformedImage).options(joinedload(TransformedImage.user)).filter(
+    stmt = select(TransformedImage).filter(
         TransformedImage.id == image_id
     )
     result = await db.execute(stmt)
 
-    return result.unique().scalar_one_or_none()
-
-async def get_by_url(url: str, db: AsyncSession):
-    stmt = select(TransformedImage).options(joinedload(TransformedImage.user)).filter(
-        TransformedImage.url == url
-    )
-    result = await db.execute(stmt)
-
-    return result.unique().scalar_one_or_none()
+    return result.scalar_one_or_none()
 
-async def save(
-    user_id: UUID, post_id: UUID, url: str, db: AsyncSession
+async def upsert(
+    user_id: UUID, post_id: UUID, transformation_key: str, url: str, db: AsyncSession
 ) -> TransformedImage:
-    new_entry = TransformedImage(
-        user_id=user_id,
-        post_id=post_id,
-        url=url,
+    rows = await upsert_many(user_id, [(post_id, transformation_key, url)], db)
+    return rows[transformation_key]
+
+
+async def upsert_many(
+    user_id: UUID, entries: list[tuple[UUID, str, str]], db: AsyncSession
+) -> dict[str, TransformedImage]:
+    # Один запит: вставка нових рядків разом з уже існуючими для конфліктних ключів.
+    # entries — (post_id, transformation_key, url); сортування за ключем дає сталий порядок блокувань
+    unique_entries = {key: (post_id, key, url) for post_id, key, url in entries}
+    keys = sorted(unique_entries)
+    table = TransformedImage.__table__
+    inserted = (
+        insert(TransformedImage)
+        .values([
+            {"user_id": user_id, "post_id": post_id, "transformation_key": key, "url": url}
+            for post_id, key, url in (unique_entries[key] for key in keys)
+        ])
+        .on_conflict_do_nothing(index_elements=[TransformedImage.transformation_key])
+        .returning(*table.c)
+        .cte("inserted")
     )
-    db.add(new_entry)
+    existing = select(*table.c).where(TransformedImage.transformation_key.in_(keys))
+    stmt = select(TransformedImage).from_statement(union_all(select(*inserted.c), existing))
+    result = await db.execute(stmt)
+    images = {image.transformation_key: image for image in result.scalars().all()}
+    missing = [key for key in keys if key not in images]
+    if missing:
+        # Конкурентна вставка закомітилась після знімка нашого запиту
+        result = await db.execute(
+            select(TransformedImage).filter(TransformedImage.transformation_key.in_(missing))
+        )
+        images.update((image.transformation_key, image) for image in result.scalars().all())
     await db.commit()
-    await db.refresh(new_entry)
-    return new_entry
+    return images
@@ -11,6 +11,9 @@ from src.models.users import Role, User, Gender
 from src.schemas.user import UserCreationSchema
 from src.core import config, log
 from src.services.auth import auth_service
+from src.services.refresh_tokens import refresh_token_store
+from src.services.token_cache import token_cache
+from src.services.user_cache import user_cache
 
 
 
@@ -29,11 +32,6 @@ async def create_user(body: UserCreationSchema, db: AsyncSession = Depends(get_d
     return user
 
 
-async def update_token(user: User, token: str | None, db: AsyncSession):
-    user.refresh_token = token
-    await db.commit()
-
-
 async def get_all_users_from_db(db: AsyncSession) -> List[User]:
     result = await db.execute(select(User))
     users = list(result.scalars().all())  # Явна конвертація
@@ -57,6 +55,7 @@ async def update_user(email: str, update_data: dict, db: AsyncSession) -> User:
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await user_cache.invalidate(email)
     return user
 
 
@@ -70,7 +69,7 @@ async def create_admin(db: AsyncSession) -> User:
     admin_user = User(
         full_name=config.admin_config.ADMIN_FULLNAME,
         email=config.admin_config.ADMIN_EMAIL,
-        password=auth_service.get_password_hash(config.admin_config.ADMIN_PASSWORD),
+        password=await auth_service.get_password_hash(config.admin_config.ADMIN_PASSWORD),
         age=config.admin_config.ADMIN_AGE,
         gender=config.admin_config.ADMIN_GENDER,
         role=Role.admin,
@@ -103,10 +102,11 @@ async def update_user_profile(user: User,
     if gender is not None:
         user.gender = gender
     if password is not None:
-        user.password = auth_service.get_password_hash(password)
+        user.password = await auth_service.get_password_hash(password)
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await user_cache.invalidate(user.email)
     return user
 
 
@@ -115,4 +115,7 @@ async def ban_user(user: User, db: AsyncSession):
         user.is_active = False
         await db.commit()
         await db.refresh(user)
+        await user_cache.invalidate(user.email)
+        token_cache.evict_user(user.email)
+        await refresh_token_store.revoke_all(user.email)
     return user
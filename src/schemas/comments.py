@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from uuid import UUID
@@ -8,4 +9,13 @@ class CommentSchema(BaseModel):
     post_id: UUID
     message: str
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class CommentPageSchema(BaseModel):
+    items: List[CommentSchema]
+    next_cursor: Optional[str] = None
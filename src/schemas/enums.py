@@ -34,4 +34,10 @@ class CloudinaryFormatEnum(str, Enum):
     gif = "gif"
     bmp = "bmp"
     tiff = "tiff"
-    ico = "ico"
\ No newline at end of file
+    ico = "ico"
+
+class QrErrorCorrectionEnum(str, Enum):
+    L = "L"
+    M = "M"
+    Q = "Q"
+    H = "H"
@@ -2,7 +2,9 @@
 from pydantic import BaseModel, Field, HttpUrl
 from datetime import datetime
 from uuid import UUID
-from typing import Any
+from typing import Annotated, Any, Literal, Union
+
+from src.schemas.enums import CloudinaryCropEnum, CloudinaryEffectEnum, CloudinaryQualityEnum, CloudinaryFormatEnum
 
 class TransformResponseImageSchema(BaseModel):
     url: HttpUrl
@@ -17,3 +19,41 @@ class TransformResponseImageSchema(BaseModel):
 class ImageRequestSchema(BaseModel):
     image_url: HttpUrl
     transformation: dict[str, Any]  # Allows for mixed value types (str, int, float)
+
+
+class ResizeSpecSchema(BaseModel):
+    operation: Literal["resize"]
+    width: int = Field(gt=0)
+    height: int = Field(gt=0)
+    crop: CloudinaryCropEnum
+
+
+class FilterSpecSchema(BaseModel):
+    operation: Literal["apply_filter"]
+    effect: CloudinaryEffectEnum
+    value: int
+
+
+class ReduceSizeSpecSchema(BaseModel):
+    operation: Literal["reduce_size"]
+    quality: CloudinaryQualityEnum
+    format: CloudinaryFormatEnum
+
+
+TransformSpecSchema = Annotated[
+    Union[ResizeSpecSchema, FilterSpecSchema, ReduceSizeSpecSchema], Field(discriminator="operation")
+]
+
+
+class BatchTransformRequestSchema(BaseModel):
+    post_ids: list[UUID] = Field(min_length=1, max_length=50)
+    transformations: list[TransformSpecSchema] = Field(min_length=1, max_length=10)
+
+
+class BatchTransformRowSchema(BaseModel):
+    post_id: UUID
+    images: list[TransformResponseImageSchema]  # У порядку transformations із запиту
+
+
+class BatchTransformResponseSchema(BaseModel):
+    items: list[BatchTransformRowSchema]  # У порядку post_ids із запиту
@@ -36,3 +36,18 @@ class PostResponseSchema(BaseModel):
         "from_attributes": True
     }
 
+
+class PostPageSchema(BaseModel):
+    items: List[PostResponseSchema]
+    next_cursor: Optional[str] = None
+
+
+class RatingSummarySchema(BaseModel):
+    post_id: UUID
+    rating_count: int
+    rating_avg: float
+
+
+class TopRatedPostSchema(PostResponseSchema):
+    rating_count: int
+    rating_avg: float
@@ -29,6 +29,12 @@ class TokenSchema(BaseModel):
     refresh_token: str
     token_type: str = "bearer"
 
+class SessionSchema(BaseModel):
+    session_id: str
+    device: str
+    created_at: int  # unix time
+    last_used_at: int  # unix time останньої ротації
+
 class UserProfileSchema(BaseModel):
     email: EmailStr
     full_name: str
@@ -47,3 +53,16 @@ class UserMeSchema(BaseModel):
     age: int
     created_at: datetime
     updated_at: datetime
+
+
+class UserSnapshotSchema(BaseModel):
+    # Компактний знімок користувача для кешу автентифікації (без pickle ORM-об'єкта)
+    v: int = 1
+    id: UUID
+    email: str
+    role: Role
+    is_active: bool
+
+    model_config = {
+        "from_attributes": True
+    }
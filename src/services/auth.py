@@ -1,22 +1,20 @@
 from datetime import datetime, timedelta, timezone
-import pickle
 from typing import Any, Coroutine, Optional
 
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
-from redis.asyncio import Redis
 
 from src.db.database import get_db
-from src.db.redis import get_redis
-from src.models.users import User
+from src.schemas.user import UserSnapshotSchema
 from src.core import config
+from src.services.password import password_service
+from src.services.token_cache import token_cache
+from src.services.user_cache import user_cache
 
 
 class Auth:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     SECRET_KEY = config.jwt_config.SECRET_KEY
     ALGORITHM = config.jwt_config.ALGORITHM
     ACCESS_TOKEN_EXPIRE_MINUTES = config.jwt_config.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -24,11 +22,11 @@ class Auth:
     EMAIL_TOKEN_EXPIRE_DAYS = config.jwt_config.EMAIL_TOKEN_EXPIRE_DAYS
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-    def verify_password(self, plan_password, hashed_password):
-        return self.pwd_context.verify(plan_password, hashed_password)
+    async def verify_password(self, plan_password, hashed_password):
+        return await password_service.verify(plan_password, hashed_password)
 
-    def get_password_hash(self, password):
-        return self.pwd_context.hash(password)
+    async def get_password_hash(self, password):
+        return await password_service.hash(password)
 
     
     def _create_token(self, data: dict, expires_delta: Optional[timedelta], scope: str):
@@ -82,39 +80,54 @@ class Auth:
         return payload["sub"]
 
 
-    async def decode_refresh_token(self, refresh_token: str) -> str:
+    async def decode_refresh_token(self, refresh_token: str) -> dict:
         payload = self._decode_token(refresh_token, expected_scope="refresh_token")
-        return payload["sub"]
+        # Токени без сесії (видані до сховища в Redis) не ротуються — потрібен новий вхід
+        if not payload.get("sub") or not payload.get("sid") or not payload.get("jti"):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+            )
+        return payload
+
+    def get_access_claims(self, token: str) -> dict | None:
+        payload = token_cache.get(token)
+        if payload is None:
+            try:
+                payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            except JWTError:
+                return None
+            if payload.get("scope") != "access_token" or payload.get("sub") is None or "exp" not in payload:
+                return None
+            token_cache.set(token, payload)
+        return payload
+
+    async def get_user_snapshot(self, email: str, db: AsyncSession) -> UserSnapshotSchema | None:
+        user = await user_cache.get(email)
+        if user is None:
+            from src.repository.user import get_user_by_email
+            db_user = await get_user_by_email(email, db)
+            if db_user is None:
+                return None
+            user = await user_cache.set(db_user)
+        return user
 
     async def authenticate_user(
-        self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db), redis: Redis = Depends(get_redis)
-    ) -> Coroutine[Any, Any, User]:
+        self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+    ) -> Coroutine[Any, Any, UserSnapshotSchema]:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-        try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            if payload["scope"] == "access_token":
-                email = payload["sub"]
-                if email is None:
-                    raise credentials_exception
-            else:
-                raise credentials_exception
-        except JWTError as e:
+        payload = self.get_access_claims(token)
+        if payload is None:
             raise credentials_exception
-        user = await redis.get(f"user:{email}")
+        user = await self.get_user_snapshot(payload["sub"], db)
         if user is None:
-            from src.repository.user import get_user_by_email
-            user = await get_user_by_email(email, db)
-            if user is None:
-                raise credentials_exception
-            await redis.set(f"user:{email}", pickle.dumps(user))
-            await redis.expire(f"user:{email}", 900)
-        else:
-            user = pickle.loads(user)
-        
+            raise credentials_exception
+        if not user.is_active:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is banned")
 
         return user
 
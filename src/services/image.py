@@ -1,23 +1,86 @@
-from cloudinary.uploader import upload
-from cloudinary.utils import cloudinary_url
+import asyncio
+import functools
+import time
+import uuid
+from typing import AsyncIterator, Callable
+
+import httpx
 from fastapi import HTTPException, UploadFile
 from src.core import config
-import cloudinary
-from cloudinary.api import delete_resources
 from src.core import log
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 class CloudinaryService:
     def __init__(
         self,
     ):
-        self.settings = cloudinary.config(
+        self._api_url = f"{config.cloudinary_config.CLOUDINARY_API_URL}/{config.cloudinary_config.CLOUDINARY_NAME}"
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(config.cloudinary_config.CLOUDINARY_UPLOAD_CONCURRENCY)
+
+    public_folder = f"user_posts/"
+
+    @functools.cached_property
+    def _cloudinary(self):
+        # SDK cloudinary імпортується при першому використанні, а не під час старту воркера
+        import cloudinary
+        import cloudinary.utils
+
+        cloudinary.config(
             cloud_name=config.cloudinary_config.CLOUDINARY_NAME,
             api_key=config.cloudinary_config.CLOUDINARY_API_KEY,
             api_secret=config.cloudinary_config.CLOUDINARY_API_SECRET,
             secure=True,
         )
+        return cloudinary.utils
 
-    public_folder = f"user_posts/"
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Один пул keep-alive з'єднань на воркер
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=config.cloudinary_config.CLOUDINARY_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=config.cloudinary_config.CLOUDINARY_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.cloudinary_config.CLOUDINARY_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _signed_params(self, params: dict) -> dict:
+        params = {**params, "timestamp": int(time.time())}
+        params["signature"] = self._cloudinary.api_sign_request(params, config.cloudinary_config.CLOUDINARY_API_SECRET)
+        params["api_key"] = str(config.cloudinary_config.CLOUDINARY_API_KEY)
+        return params
+
+    async def _request(self, method: str, url: str, body: Callable[[], AsyncIterator[bytes]] | None = None,
+                       **kwargs) -> dict:
+        # Обмежена конкурентність + повтори з експоненційною затримкою
+        retries = config.cloudinary_config.CLOUDINARY_MAX_RETRIES
+        backoff = config.cloudinary_config.CLOUDINARY_RETRY_BACKOFF
+        async with self._semaphore:
+            for attempt in range(retries + 1):
+                if body is not None:
+                    # Потік тіла одноразовий: на кожну спробу створюємо новий
+                    kwargs["content"] = body()
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                    if response.status_code not in RETRY_STATUSES or attempt == retries:
+                        response.raise_for_status()
+                        return response.json()
+                    log.warning(f"Cloudinary {method} {url} returned {response.status_code}, retrying")
+                except httpx.TransportError as e:
+                    if attempt == retries:
+                        raise
+                    log.warning(f"Cloudinary {method} {url} failed: {e}, retrying")
+                await asyncio.sleep(backoff * 2 ** attempt)
 
     @staticmethod
     def extract_public_id(image_url: str) -> str:
@@ -29,11 +92,43 @@ class CloudinaryService:
             raise ValueError("Invalid Cloudinary URL")
 
 
+    @staticmethod
+    def _multipart_envelope(params: dict, file: UploadFile, boundary: str) -> tuple[bytes, bytes]:
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in params.items()
+        ]
+        filename = (file.filename or "upload").replace('"', "%22").replace("\r", "").replace("\n", "")
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: {file.content_type or "application/octet-stream"}\r\n\r\n'
+        )
+        return "".join(parts).encode("utf-8"), f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    @staticmethod
+    async def _multipart_stream(file: UploadFile, head: bytes, tail: bytes) -> AsyncIterator[bytes]:
+        yield head
+        await file.seek(0)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+        yield tail
+
     async def upload(self, file: UploadFile, user_email: str):
         # Завантажуємо файл до Cloudinary
         try:
-            upload_result = upload(
-                file.file, folder=f"{self.public_folder}{user_email}", overwrite=True
+            # Тіло multipart читається з UploadFile частинами через await file.read(),
+            # тож файл, що вилився на диск, не читається блокуючим викликом у циклі подій
+            params = self._signed_params({"folder": f"{self.public_folder}{user_email}", "overwrite": True})
+            boundary = uuid.uuid4().hex
+            headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+            head, tail = self._multipart_envelope(params, file, boundary)
+            if file.size is not None:
+                headers["Content-Length"] = str(len(head) + file.size + len(tail))
+            upload_result = await self._request(
+                "POST",
+                f"{self._api_url}/image/upload",
+                body=lambda: self._multipart_stream(file, head, tail),
+                headers=headers,
             )
 
             # Отримання `public_id`
@@ -47,7 +142,7 @@ class CloudinaryService:
                 )
 
             # Формування коректного URL
-            result_url, _ = cloudinary_url(public_id, version=version)
+            result_url, _ = self._cloudinary.cloudinary_url(public_id, version=version)
 
             return result_url
         except Exception as e:
@@ -58,7 +153,12 @@ class CloudinaryService:
     async def delete(self, public_id: str):
         try:
             # Удаляем конкретное изображение
-            deleted_file_result = delete_resources(public_id)
+            deleted_file_result = await self._request(
+                "DELETE",
+                f"{self._api_url}/resources/image/upload",
+                params={"public_ids[]": public_id},
+                auth=(str(config.cloudinary_config.CLOUDINARY_API_KEY), config.cloudinary_config.CLOUDINARY_API_SECRET),
+            )
 
             return {"deleted_file": deleted_file_result}
         except Exception as e:
@@ -69,7 +169,7 @@ class CloudinaryService:
 
     async def resize(self, image_url: str, width: int, height: int, crop: str) -> str:
         try:
-            url, _ = cloudinary_url(
+            url, _ = self._cloudinary.cloudinary_url(
                 self.extract_public_id(image_url),
                 width=width,
                 height=height,
@@ -87,14 +187,14 @@ class CloudinaryService:
         public_id = self.extract_public_id(image_url)
         
         print(f"Extracted public_id: {public_id}")
-        url, _ = cloudinary_url(
+        url, _ = self._cloudinary.cloudinary_url(
             public_id,
             transformation=[{"effect": effect}]
         )
         return url
     
     async def change_format_and_quality(self, image_url: str, quality: str, format: str) -> str:
-        url, _ = cloudinary_url(
+        url, _ = self._cloudinary.cloudinary_url(
             self.extract_public_id(image_url), transformation=[{"quality": quality, "fetch_format": format}]
         )
         return url
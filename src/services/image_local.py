@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+import httpx
+from fastapi import HTTPException
+from PIL import Image
+
+from src.core import config, log
+from src.core.config.base_config import MEDIA_DIR
+from src.services import image_ops
+
+
+class LocalImageService:
+    # Трансформації Pillow у пулі процесів з контент-адресованим кешем похідних на диску
+    def __init__(self, media_dir, base_url: str, workers: int):
+        self.media_dir = str(media_dir)
+        self.base_url = base_url.rstrip("/")
+        self._workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _digest(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _source_format(cls, image_url: str) -> str:
+        # Результат зберігаємо у форматі оригіналу, якщо Pillow вміє його кодувати (AVIF — не завжди)
+        extension = os.path.splitext(urlparse(image_url).path)[1].lstrip(".").lower()
+        extension = "jpg" if extension == "jpeg" else extension
+        return cls._output_format(extension) if extension in image_ops.FORMATS and extension != "auto" else "jpg"
+
+    @staticmethod
+    def _output_format(format: str) -> str:
+        Image.init()
+        if image_ops.FORMATS[format][0] not in Image.SAVE:
+            log.warning(f"Pillow cannot encode {format}, falling back to webp")
+            return "webp"
+        return format
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.media_dir, *parts)
+
+    async def _source(self, image_url: str) -> str:
+        # Оригінал завантажуємо один раз і тримаємо на диску
+        digest = self._digest(image_url)
+        path = self._path("originals", digest[:2], digest)
+        if os.path.exists(path):
+            return path
+        response = await self.client.get(image_url)
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        await asyncio.to_thread(self._write, tmp_path, response.content)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _write(path: str, content: bytes):
+        with open(path, "wb") as out:
+            out.write(content)
+
+    async def _derive(self, image_url: str, operation: str, params: dict) -> str:
+        digest = self._digest(image_url, operation, params)
+        relative = f"derivatives/{digest[:2]}/{digest}.{image_ops.FORMATS[params['format']][1]}"
+        url = f"{self.base_url}/{relative}"
+        target = self._path(*relative.split("/"))
+        if os.path.exists(target):
+            return url
+
+        # Один рендер на ключ навіть при паралельних запитах
+        inflight = self._inflight.get(digest)
+        if inflight is not None:
+            await asyncio.shield(inflight)
+            return url
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        try:
+            source = await self._source(image_url)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, image_ops.render, source, target, operation, params)
+            future.set_result(None)
+            return url
+        except Exception as e:
+            future.set_exception(e)
+            raise HTTPException(status_code=500, detail=f"Failed to transform image: {e}")
+        finally:
+            self._inflight.pop(digest, None)
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()
+
+    async def resize(self, image_url: str, width: int, height: int, crop: str) -> str:
+        params = {"width": width, "height": height, "crop": crop, "format": self._source_format(image_url)}
+        return await self._derive(image_url, "resize", params)
+
+    async def apply_filter(self, image_url: str, effect: str) -> str:
+        name, _, value = effect.partition(":")
+        params = {"effect": name, "value": float(value or 0), "format": self._source_format(image_url)}
+        return await self._derive(image_url, "filter", params)
+
+    async def change_format_and_quality(self, image_url: str, quality: str, format: str) -> str:
+        params = {"quality": quality, "format": self._output_format(format)}
+        return await self._derive(image_url, "format", params)
+
+
+local_image_service = LocalImageService(
+    media_dir=MEDIA_DIR,
+    base_url=config.transform_config.LOCAL_MEDIA_BASE_URL,
+    workers=config.transform_config.IMAGE_TRANSFORM_WORKERS,
+)
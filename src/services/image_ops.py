@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+
+# Ступені якості Cloudinary -> якість кодека Pillow
+QUALITY = {
+    "auto": 80,
+    "auto:best": 95,
+    "auto:good": 85,
+    "auto:eco": 70,
+    "auto:low": 50,
+}
+
+# Формат Cloudinary -> (формат Pillow, розширення файлу)
+FORMATS = {
+    "auto": ("WEBP", "webp"),
+    "jpg": ("JPEG", "jpg"),
+    "png": ("PNG", "png"),
+    "webp": ("WEBP", "webp"),
+    "avif": ("AVIF", "avif"),
+    "gif": ("GIF", "gif"),
+    "bmp": ("BMP", "bmp"),
+    "tiff": ("TIFF", "tiff"),
+    "ico": ("ICO", "ico"),
+}
+
+
+def resize(img: Image.Image, width: int, height: int, crop: str) -> Image.Image:
+    if crop == "scale":
+        return img.resize((width, height), Image.Resampling.LANCZOS)
+    if crop == "fit":
+        fitted = img.copy()
+        fitted.thumbnail((width, height), Image.Resampling.LANCZOS)
+        return fitted
+    # fill і thumb: заповнюємо рамку з обрізанням по центру
+    return ImageOps.fit(img, (width, height), Image.Resampling.LANCZOS)
+
+
+def _hue(img: Image.Image, degrees: int) -> Image.Image:
+    h, s, v = img.convert("HSV").split()
+    shift = int(degrees / 360 * 256)
+    h = h.point(lambda x: (x + shift) % 256)
+    return Image.merge("HSV", (h, s, v)).convert("RGB")
+
+
+def _vignette(img: Image.Image, strength: int) -> Image.Image:
+    # radial_gradient: 0 у центрі, 255 на краях
+    mask = Image.radial_gradient("L").resize(img.size, Image.Resampling.BILINEAR)
+    mask = mask.point(lambda x: min(255, int(x * strength / 100 * 1.5)))
+    return Image.composite(Image.new("RGB", img.size, "black"), img, mask)
+
+
+def apply_effect(img: Image.Image, effect: str, value: float) -> Image.Image:
+    img = img.convert("RGB")
+    if effect == "blur":
+        return img.filter(ImageFilter.GaussianBlur(radius=value / 20))
+    if effect == "pixelate":
+        block = max(1, int(value))
+        small = img.resize((max(1, img.width // block), max(1, img.height // block)), Image.Resampling.BILINEAR)
+        return small.resize(img.size, Image.Resampling.NEAREST)
+    if effect == "oil_paint":
+        size = max(3, int(value) // 10 * 2 + 1)
+        return img.filter(ImageFilter.ModeFilter(size))
+    if effect == "brightness":
+        return ImageEnhance.Brightness(img).enhance(1 + value / 100)
+    if effect == "contrast":
+        return ImageEnhance.Contrast(img).enhance(1 + value / 100)
+    if effect == "saturation":
+        return ImageEnhance.Color(img).enhance(1 + value / 100)
+    if effect == "hue":
+        return _hue(img, int(value))
+    if effect == "gamma":
+        gamma = 1 / value if value else 1
+        return img.point(lambda x: int(255 * (x / 255) ** gamma))
+    if effect == "sharpen":
+        return img.filter(ImageFilter.UnsharpMask(radius=2, percent=int(value * 3), threshold=3))
+    if effect == "vignette":
+        return _vignette(img, int(value))
+    raise ValueError(f"Unsupported effect: {effect}")
+
+
+def save(img: Image.Image, path: str, format: str, quality: str = "auto"):
+    pil_format, _ = FORMATS[format]
+    if pil_format == "JPEG":
+        img = img.convert("RGB")
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Запис у тимчасовий файл і атомарне перейменування: паралельні воркери не бачать напівзаписаних файлів
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            img.save(out, format=pil_format, quality=QUALITY.get(quality, 80))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def render(source_path: str, target_path: str, operation: str, params: dict):
+    # Виконується у процесі пулу: лише Pillow, без імпорту застосунку
+    with Image.open(source_path) as img:
+        img.load()
+        if operation == "resize":
+            result = resize(img, params["width"], params["height"], params["crop"])
+            save(result, target_path, params["format"])
+        elif operation == "filter":
+            result = apply_effect(img, params["effect"], params["value"])
+            save(result, target_path, params["format"])
+        elif operation == "format":
+            save(img, target_path, params["format"], params["quality"])
+        else:
+            raise ValueError(f"Unsupported operation: {operation}")
@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    # Непрозорий курсор: позиція останнього елемента сторінки у порядку (created_at, id)
+    return _encode({"c": created_at.isoformat(), "i": str(item_id)})
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = _decode(cursor)
+        return datetime.fromisoformat(raw["c"]), UUID(raw["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, item_id: UUID) -> str:
+    # Курсор для ранжованих результатів у порядку (rank, id)
+    return _encode({"r": rank, "i": str(item_id)})
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        raw = _decode(cursor)
+        return float(raw["r"]), UUID(raw["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from src.core import config, log
+from src.core.metrics import registry, Counter, Gauge, Histogram
+
+password_hash_duration_seconds = registry.register(
+    Histogram("password_hash_duration_seconds", "bcrypt hash/verify latency", ("operation",),
+              buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+)
+password_hash_pending = registry.register(
+    Gauge("password_hash_pending", "bcrypt operations running or queued")
+)
+password_hash_rejected_total = registry.register(
+    Counter("password_hash_rejected_total", "bcrypt operations rejected because the pool was saturated")
+)
+
+
+class PasswordService:
+    def __init__(self, workers: int, max_queue: int):
+        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self._workers = workers
+        self._max_pending = workers + max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _timed(func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - started
+
+    async def _run(self, operation: str, func, *args):
+        # bcrypt звільняє GIL, тому пул потоків не блокує event loop
+        if self._pending >= self._max_pending:
+            password_hash_rejected_total.inc()
+            log.warning("Password hashing pool is saturated")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        password_hash_pending.set(self._pending)
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self.executor, self._timed, func, *args)
+            password_hash_duration_seconds.observe(elapsed, operation=operation)
+            return result
+        finally:
+            self._pending -= 1
+            password_hash_pending.set(self._pending)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", self.pwd_context.verify, plain_password, hashed_password)
+
+
+password_service = PasswordService(
+    workers=config.password_config.PASSWORD_HASH_WORKERS,
+    max_queue=config.password_config.PASSWORD_HASH_MAX_QUEUE,
+)
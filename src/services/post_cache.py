@@ -0,0 +1,119 @@
+import asyncio
+import uuid
+from typing import Awaitable, Callable, Iterable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core import config, log
+from src.db.redis import redis_manager
+
+# Видаляємо lock лише якщо він досі наш
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class PostCache:
+    # Read-through кеш серіалізованих PostResponseSchema з захистом від stampede
+    SCHEMA_VERSION = 1
+
+    def __init__(self, ttl: int, lock_ttl_ms: int, lock_wait: float):
+        self.ttl = ttl
+        self.lock_ttl_ms = lock_ttl_ms
+        self.lock_wait = lock_wait
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def post_key(self, post_id: UUID) -> str:
+        return f"post:v{self.SCHEMA_VERSION}:{post_id}"
+
+    def tag_key(self, tag_name: str) -> str:
+        return f"tag_posts:v{self.SCHEMA_VERSION}:{tag_name}"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes | None]]) -> bytes | None:
+        # Single-flight у межах воркера: один завантажувач на ключ
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await self._read_through(key, loader)
+            future.set_result(payload)
+            return payload
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()  # позначаємо виняток як оброблений
+
+    async def _read_through(self, key: str, loader: Callable[[], Awaitable[bytes | None]]) -> bytes | None:
+        token = uuid.uuid4().hex
+        lock_key = f"{key}:lock"
+        try:
+            async with redis_manager.session() as redis:
+                payload = await redis.get(key)
+                if payload is not None:
+                    return payload
+
+                # Між воркерами: лише власник lock-а йде в Postgres, решта чекає на значення
+                locked = await redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+                if not locked:
+                    waited = 0.0
+                    while waited < self.lock_wait:
+                        await asyncio.sleep(0.02)
+                        waited += 0.02
+                        payload = await redis.get(key)
+                        if payload is not None:
+                            return payload
+        except RedisError as e:
+            # Недоступний Redis не має ламати читання: віддаємо дані напряму з Postgres
+            log.error(f"Post cache read failed for {key}: {e}")
+            return await loader()
+
+        if not locked:
+            log.debug(f"Cache lock wait timed out for {key}")
+            return await loader()
+
+        try:
+            payload = await loader()
+            if payload is not None:
+                await self._safe_call("store", key, lambda redis: redis.set(key, payload, ex=self.ttl))
+            return payload
+        finally:
+            await self._safe_call("unlock", key, lambda redis: redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token))
+
+    @staticmethod
+    async def _safe_call(action: str, key: str, command: Callable[[Redis], Awaitable]):
+        try:
+            async with redis_manager.session() as redis:
+                await command(redis)
+        except RedisError as e:
+            log.error(f"Post cache {action} failed for {key}: {e}")
+
+    async def invalidate(self, post_id: UUID | None = None, tag_names: Iterable[str] = ()):
+        keys = [self.tag_key(name) for name in tag_names]
+        if post_id is not None:
+            keys.append(self.post_key(post_id))
+        if not keys:
+            return
+        try:
+            async with redis_manager.session() as redis:
+                await redis.delete(*keys)
+        except Exception as e:
+            log.error(f"Failed to invalidate post cache {keys}: {e}")
+
+
+post_cache = PostCache(
+    ttl=config.cache_config.POST_CACHE_TTL,
+    lock_ttl_ms=config.cache_config.POST_CACHE_LOCK_TTL_MS,
+    lock_wait=config.cache_config.POST_CACHE_LOCK_WAIT,
+)
@@ -1,61 +1,133 @@
-import qrcode
-from qrcode.image.svg import SvgPathFillImage
-from qrcode.image.pil import PilImage
 import asyncio
-from PIL import Image
+import hashlib
+import re
+from collections import OrderedDict
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+from src.core import config, log
+from src.db.redis import redis_manager
+
+if TYPE_CHECKING:
+    import qrcode
+    from PIL import Image
+
+# qrcode і PIL імпортуються при першому рендері, а не під час старту воркера
+BORDER = 4
+
+
+class QrCodeTooSmall(ValueError):
+    # Розмір менший за кількість модулів з рамкою: код неможливо відсканувати
+    def __init__(self, size: int, minimum: int):
+        super().__init__(f"QR code needs at least {minimum}px for this data, got {size}px")
+        self.size = size
+        self.minimum = minimum
+
+
 class QrCodeService:
-    async def generatePilImageAsync(self, data: str, size: int = 200) -> Image:
-        qr = qrcode.QRCode(
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+    def __init__(self, local_size: int, redis_ttl: int, use_redis: bool):
+        self.local_size = local_size
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self._local: OrderedDict[str, bytes] = OrderedDict()
 
-        # Масштабируем изображение до нужного размера
-        img = img.resize((size, size), Image.Resampling.LANCZOS)
-        return img
+    @staticmethod
+    def _matrix(data: str, error_correction: str, image_factory=None) -> "qrcode.QRCode":
+        import qrcode
 
-    def generatePilImage(self, data: str, size: int = 200) -> Image:
         qr = qrcode.QRCode(
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
+            image_factory=image_factory,
+            error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{error_correction}"),
+            box_size=1,
+            border=BORDER,
         )
         qr.add_data(data)
         qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+        return qr
+
+    @staticmethod
+    def _check_size(qr: "qrcode.QRCode", size: int) -> int:
+        # Мінімум — один піксель на модуль; менший розмір зливав би модулі
+        modules = qr.modules_count + 2 * BORDER
+        if size < modules:
+            raise QrCodeTooSmall(size, modules)
+        return modules
 
-        # Масштабируем изображение до нужного размера
-        img = img.resize((size, size), Image.Resampling.LANCZOS)
+    def generatePilImage(self, data: str, size: int = 200, error_correction: str = "H") -> "Image.Image":
+        from PIL import Image
+
+        qr = self._matrix(str(data), error_correction)
+        modules = self._check_size(qr, size)
+        # Рендеримо одразу цілим розміром модуля, без масштабування; залишок — біле поле
+        qr.box_size = size // modules
+        img = qr.make_image(fill_color="black", back_color="white").get_image().convert("RGB")
+        if img.size[0] < size:
+            canvas = Image.new("RGB", (size, size), "white")
+            offset = (size - img.size[0]) // 2
+            canvas.paste(img, (offset, offset))
+            img = canvas
         return img
-    
-    async def generateSvgAsync(self, data:str, size:int=200) -> str:
-        qr = qrcode.QRCode(
-            image_factory=SvgPathFillImage,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        svg_string = img.to_string().decode('utf-8').replace('width="37mm"', f'width="{size}px"').replace('height="37mm"', f'height="{size}px"')
-        return svg_string
-    
-    def generateSvg(self, data:str, size:int=200) -> str:
-        qr = qrcode.QRCode(
-            image_factory=SvgPathFillImage,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+
+    def generateSvg(self, data: str, size: int = 200, error_correction: str = "H") -> str:
+        from qrcode.image.svg import SvgPathFillImage
+
+        qr = self._matrix(str(data), error_correction, image_factory=SvgPathFillImage)
+        self._check_size(qr, size)
         img = qr.make_image(fill_color="black", back_color="white")
-        svg_string = img.to_string().decode('utf-8').replace('width="37mm"', f'width="{size}px"').replace('height="37mm"', f'height="{size}px"')
+        svg_string = img.to_string().decode('utf-8')
+        svg_string = re.sub(r'width="[\d.]+mm"', f'width="{size}px"', svg_string, count=1)
+        svg_string = re.sub(r'height="[\d.]+mm"', f'height="{size}px"', svg_string, count=1)
         return svg_string
 
-qrcode_service = QrCodeService()
\ No newline at end of file
+    def _render(self, data: str, size: int, format: str, error_correction: str) -> bytes:
+        if format == "svg":
+            return self.generateSvg(data, size, error_correction).encode("utf-8")
+        buffer = BytesIO()
+        self.generatePilImage(data, size, error_correction).save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    def _remember(self, key: str, content: bytes):
+        self._local[key] = content
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def render(self, data: str, size: int = 200, format: str = "png", error_correction: str = "H") -> tuple[bytes, str]:
+        # Контент-адресований ключ; він же сильний ETag
+        key = hashlib.sha256(f"{data}\0{size}\0{format}\0{error_correction}".encode("utf-8")).hexdigest()
+        content = self._local.get(key)
+        if content is not None:
+            self._local.move_to_end(key)
+            return content, key
+
+        redis_key = f"qr:{key}"
+        if self.use_redis:
+            try:
+                async with redis_manager.session() as redis:
+                    content = await redis.get(redis_key)
+            except Exception as e:
+                log.warning(f"QR cache read failed: {e}")
+        if content is None:
+            content = await asyncio.to_thread(self._render, str(data), size, format, error_correction)
+            if self.use_redis:
+                try:
+                    async with redis_manager.session() as redis:
+                        await redis.set(redis_key, content, ex=self.redis_ttl)
+                except Exception as e:
+                    log.warning(f"QR cache write failed: {e}")
+        self._remember(key, content)
+        return content, key
+
+    async def generatePilImageAsync(self, data: str, size: int = 200, error_correction: str = "H") -> "Image.Image":
+        return await asyncio.to_thread(self.generatePilImage, data, size, error_correction)
+
+    async def generateSvgAsync(self, data: str, size: int = 200, error_correction: str = "H") -> str:
+        content, _ = await self.render(data, size, "svg", error_correction)
+        return content.decode("utf-8")
+
+
+qrcode_service = QrCodeService(
+    local_size=config.cache_config.QR_CACHE_LOCAL_SIZE,
+    redis_ttl=config.cache_config.QR_CACHE_TTL,
+    use_redis=config.cache_config.QR_CACHE_REDIS,
+)
@@ -0,0 +1,146 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+
+from src.core import config, log
+from src.core.metrics import rate_limit_decisions_total
+from src.db.redis import redis_manager
+from src.services.auth import auth_service
+
+# GCRA за один виклик Redis. KEYS[1] — ключ клієнта; ARGV: інтервал між запитами (мс),
+# допуск (мс, дорівнює періоду політики), розмір оренди. Повертає {видано запитів, retry_after мс}
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local granted = tonumber(ARGV[3])
+if tat + granted * interval - now > tolerance then
+    granted = 1
+end
+local new_tat = tat + granted * interval
+if new_tat - now > tolerance then
+    return {0, math.ceil(new_tat - now - tolerance)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(1, math.ceil(new_tat - now)))
+return {granted, 0}
+"""
+
+
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    times: int
+    seconds: float
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "Policy":
+        times, seconds = spec.split("/")
+        return cls(name, int(times), float(seconds))
+
+    @property
+    def interval_ms(self) -> float:
+        return self.seconds * 1000 / self.times
+
+
+class RateLimiterService:
+    # Глобальний ліміт у Redis (GCRA) + локальна оренда: коли клієнт явно нижче ліміту,
+    # воркер резервує кілька запитів одним викликом і наступні обслуговує без Redis
+    def __init__(self, policies: dict[str, str], lease: int, local_size: int, trust_forwarded: bool, enabled: bool):
+        self.policies = {name: Policy.parse(name, spec) for name, spec in policies.items()}
+        self.lease = max(1, lease)
+        self.local_size = local_size
+        self.trust_forwarded = trust_forwarded
+        self.enabled = enabled
+        self._local: OrderedDict[str, list] = OrderedDict()  # key -> [токени, expires_at]
+
+    def identity(self, request: Request) -> str:
+        # Автентифікований клієнт лімітується за користувачем, а не за спільним IP проксі
+        authorization = request.headers.get("authorization", "")
+        if authorization[:7].lower() == "bearer ":
+            claims = auth_service.get_access_claims(authorization[7:])
+            if claims is not None:
+                return f"user:{claims['sub']}"
+        if self.trust_forwarded:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return f"ip:{forwarded.split(',')[0].strip()}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    def _take_local(self, key: str) -> bool:
+        entry = self._local.get(key)
+        if entry is None:
+            return False
+        if entry[0] <= 0 or entry[1] <= time.monotonic():
+            del self._local[key]
+            return False
+        entry[0] -= 1
+        self._local.move_to_end(key)
+        return True
+
+    def _store_local(self, key: str, tokens: int, policy: Policy):
+        self._local[key] = [tokens, time.monotonic() + policy.seconds]
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def check(self, policy_name: str, key: str) -> float | None:
+        # None — запит дозволено, інакше — скільки секунд чекати
+        policy = self.policies[policy_name]
+        if self._take_local(key):
+            rate_limit_decisions_total.inc(policy=policy.name, decision="local")
+            return None
+        try:
+            async with redis_manager.session() as redis:
+                granted, retry_after_ms = await redis.eval(
+                    GCRA_SCRIPT, 1, key, policy.interval_ms, policy.seconds * 1000, min(self.lease, policy.times)
+                )
+        except Exception as e:
+            # Недоступний Redis не повинен класти API: пропускаємо запит
+            log.warning(f"Rate limiter unavailable: {e}")
+            rate_limit_decisions_total.inc(policy=policy.name, decision="error")
+            return None
+        if int(granted) == 0:
+            rate_limit_decisions_total.inc(policy=policy.name, decision="limited")
+            return int(retry_after_ms) / 1000
+        if int(granted) > 1:
+            self._store_local(key, int(granted) - 1, policy)
+        rate_limit_decisions_total.inc(policy=policy.name, decision="redis")
+        return None
+
+
+rate_limiter = RateLimiterService(
+    policies=config.rate_limit_config.RATE_LIMIT_POLICIES,
+    lease=config.rate_limit_config.RATE_LIMIT_LOCAL_LEASE,
+    local_size=config.rate_limit_config.RATE_LIMIT_LOCAL_SIZE,
+    trust_forwarded=config.rate_limit_config.RATE_LIMIT_TRUST_FORWARDED,
+    enabled=config.rate_limit_config.RATE_LIMIT_ENABLED,
+)
+
+
+class RateLimit:
+    # Залежність маршруту: Depends(RateLimit("posts:read")); лічильник окремий для кожного маршруту
+    def __init__(self, policy: str):
+        if policy not in rate_limiter.policies:
+            raise ValueError(f"Unknown rate limit policy: {policy}")
+        self.policy = policy
+
+    async def __call__(self, request: Request):
+        if not rate_limiter.enabled:
+            return
+        route = request.scope.get("route")
+        key = f"rl:v1:{self.policy}:{getattr(route, 'path', request.url.path)}:{rate_limiter.identity(request)}"
+        retry_after = await rate_limiter.check(self.policy, key)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too Many Requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
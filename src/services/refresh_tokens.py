@@ -0,0 +1,116 @@
+import time
+import uuid
+
+from src.core import config
+from src.db.redis import redis_manager
+
+# KEYS[1] — сімейство, KEYS[2] — сесії користувача; ARGV: пред'явлений jti, новий jti, ttl, час, sid
+ROTATE_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'jti')
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], ARGV[5])
+    return -1
+end
+redis.call('HSET', KEYS[1], 'jti', ARGV[2], 'rotated_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# KEYS[1] — сімейство, KEYS[2] — сесії користувача; ARGV: email власника, sid.
+# Чуже або вже неіснуюче сімейство не чіпаємо
+REVOKE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'email') ~= ARGV[1] then
+    redis.call('SREM', KEYS[2], ARGV[2])
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[2])
+return 1
+"""
+
+ROTATED = 1
+REVOKED = 0
+REUSED = -1
+
+
+class RefreshTokenStore:
+    # Сімейства refresh-токенів у Redis: одна сесія (пристрій) = одне сімейство з поточним jti.
+    # Пред'явлення вже ротованого jti означає крадіжку токена — сімейство відкликається повністю
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @staticmethod
+    def _family_key(sid: str) -> str:
+        return f"rt:v1:family:{sid}"
+
+    @staticmethod
+    def _user_key(email: str) -> str:
+        return f"rt:v1:user:{email}"
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    async def issue(self, email: str, device: str) -> tuple[str, str]:
+        sid, jti = self.new_id(), self.new_id()
+        now = int(time.time())
+        async with redis_manager.session() as redis:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self._family_key(sid), mapping={
+                    "email": email, "jti": jti, "device": device, "created_at": now, "rotated_at": now,
+                })
+                pipe.expire(self._family_key(sid), self.ttl)
+                pipe.sadd(self._user_key(email), sid)
+                pipe.expire(self._user_key(email), self.ttl)
+                await pipe.execute()
+        return sid, jti
+
+    async def rotate(self, email: str, sid: str, jti: str) -> tuple[int, str | None]:
+        new_jti = self.new_id()
+        async with redis_manager.session() as redis:
+            result = await redis.eval(
+                ROTATE_SCRIPT, 2, self._family_key(sid), self._user_key(email),
+                jti, new_jti, self.ttl, int(time.time()), sid,
+            )
+        return int(result), new_jti if int(result) == ROTATED else None
+
+    async def revoke(self, email: str, sid: str) -> bool:
+        # Повертає False, якщо сесія не належить користувачу або вже не існує
+        async with redis_manager.session() as redis:
+            result = await redis.eval(REVOKE_SCRIPT, 2, self._family_key(sid), self._user_key(email), email, sid)
+        return bool(result)
+
+    async def revoke_all(self, email: str):
+        async with redis_manager.session() as redis:
+            sids = await redis.smembers(self._user_key(email))
+            keys = [self._family_key(sid.decode()) for sid in sids]
+            await redis.delete(*keys, self._user_key(email))
+
+    async def sessions(self, email: str) -> list[dict]:
+        async with redis_manager.session() as redis:
+            sids = sorted(sid.decode() for sid in await redis.smembers(self._user_key(email)))
+            async with redis.pipeline(transaction=False) as pipe:
+                for sid in sids:
+                    pipe.hgetall(self._family_key(sid))
+                families = await pipe.execute()
+            # Сімейства, що вже вичерпали TTL, прибираємо з індексу користувача
+            expired = [sid for sid, family in zip(sids, families) if not family]
+            if expired:
+                await redis.srem(self._user_key(email), *expired)
+        return [
+            {
+                "session_id": sid,
+                "device": family[b"device"].decode(),
+                "created_at": int(family[b"created_at"]),
+                "last_used_at": int(family[b"rotated_at"]),
+            }
+            for sid, family in zip(sids, families) if family
+        ]
+
+
+refresh_token_store = RefreshTokenStore(ttl=config.jwt_config.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
@@ -1,6 +1,7 @@
 from fastapi import Request, Depends, HTTPException, status
 
-from src.models.users import Role, User
+from src.models.users import Role
+from src.schemas.user import UserSnapshotSchema
 from src.core import log
 from src.services.auth import auth_service
 
@@ -10,7 +11,7 @@ class RoleAccessService:
         self.allowed_roles = allowed_roles
 
     async def __call__(
-            self, request: Request, user: User = Depends(auth_service.authenticate_user)
+            self, request: Request, user: UserSnapshotSchema = Depends(auth_service.authenticate_user)
     ):
         if user.role not in self.allowed_roles:
             log.debug(f"User {user.role} is not allowed")
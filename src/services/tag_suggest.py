@@ -0,0 +1,67 @@
+import asyncio
+import bisect
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import config
+
+
+class TagSuggester:
+    # Відсортований масив популярних тегів у воркері для typeahead без запиту до БД
+    def __init__(self, capacity: int, refresh_interval: int):
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        self._keys: list[str] = []
+        self._names: dict[str, str] = {}
+        self._complete = False
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_interval:
+                return
+            from src.repository.tags import get_popular_tag_names
+            names = await get_popular_tag_names(self.capacity + 1, db)
+            self._complete = len(names) <= self.capacity
+            # Порядок вставки — черга витіснення: спершу найменш популярні
+            self._names = {name.casefold(): name for name in reversed(names[:self.capacity])}
+            self._keys = sorted(self._names)
+            self._loaded_at = time.monotonic()
+
+    def add(self, name: str):
+        key = name.casefold()
+        if key in self._names:
+            return
+        if len(self._names) >= self.capacity:
+            # Між перезавантаженнями тримаємо не більше capacity тегів, решту шукає БД
+            evicted = next(iter(self._names))
+            del self._names[evicted]
+            del self._keys[bisect.bisect_left(self._keys, evicted)]
+            self._complete = False
+        self._names[key] = name
+        bisect.insort(self._keys, key)
+
+    def suggest(self, prefix: str, limit: int) -> list[str] | None:
+        # None означає, що локальних даних недостатньо і треба спитати БД
+        if self._loaded_at is None:
+            return None
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self._keys, prefix)
+        result = []
+        for key in self._keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            result.append(self._names[key])
+        if len(result) < limit and not self._complete:
+            return None
+        return result
+
+
+tag_suggester = TagSuggester(
+    capacity=config.cache_config.TAG_SUGGEST_CAPACITY,
+    refresh_interval=config.cache_config.TAG_SUGGEST_REFRESH,
+)
@@ -0,0 +1,55 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from src.core import config
+
+
+class TokenCache:
+    # Перевірені claims access-токенів до їх exp: повторний токен — пошук у словнику замість HMAC
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self._by_email: dict[str, set[bytes]] = {}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        # Сирий токен у пам'яті не зберігаємо
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def _drop(self, digest: bytes):
+        claims = self._entries.pop(digest, None)
+        if claims is None:
+            return
+        digests = self._by_email.get(claims["sub"])
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_email[claims["sub"]]
+
+    def get(self, token: str) -> dict | None:
+        digest = self._digest(token)
+        claims = self._entries.get(digest)
+        if claims is None:
+            return None
+        if claims["exp"] <= time.time():
+            self._drop(digest)
+            return None
+        self._entries.move_to_end(digest)
+        return claims
+
+    def set(self, token: str, claims: dict):
+        digest = self._digest(token)
+        self._entries[digest] = claims
+        self._entries.move_to_end(digest)
+        self._by_email.setdefault(claims["sub"], set()).add(digest)
+        while len(self._entries) > self.size:
+            self._drop(next(iter(self._entries)))
+
+    def evict_user(self, email: str):
+        # Лише звільняє пам'ять цього воркера: JWT лишається валідним до exp, інші воркери його приймуть
+        for digest in list(self._by_email.get(email, ())):
+            self._drop(digest)
+
+
+token_cache = TokenCache(size=config.cache_config.TOKEN_CACHE_SIZE)
@@ -0,0 +1,17 @@
+import hashlib
+import json
+from uuid import UUID
+
+from src.core import config
+
+# Бекенд трансформацій обирається конфігурацією розгортання
+if config.transform_config.IMAGE_TRANSFORM_BACKEND == "local":
+    from src.services.image_local import local_image_service as transform_service
+else:
+    from src.services.image import cloudinary_service as transform_service
+
+
+def transformation_key(post_id: UUID, operation: str, params: dict) -> str:
+    # Канонічний ключ трансформації: однакові параметри дають однаковий ключ незалежно від порядку
+    canonical = json.dumps([str(post_id), operation, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
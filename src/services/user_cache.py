@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+
+from pydantic import ValidationError
+
+from src.core import config, log
+from src.db.redis import redis_manager
+from src.schemas.user import UserSnapshotSchema
+
+
+class UserCache:
+    # Дворівневий кеш: локальний TTL/LRU у воркері перед Redis
+    SCHEMA_VERSION = 1
+
+    def __init__(self, ttl: int, local_ttl: int, local_size: int):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local_size = local_size
+        self._local: OrderedDict[str, tuple[float, UserSnapshotSchema]] = OrderedDict()
+
+    def _key(self, email: str) -> str:
+        return f"user:v{self.SCHEMA_VERSION}:{email}"
+
+    def _set_local(self, snapshot: UserSnapshotSchema):
+        self._local[snapshot.email] = (time.monotonic() + self.local_ttl, snapshot)
+        self._local.move_to_end(snapshot.email)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def get(self, email: str) -> UserSnapshotSchema | None:
+        entry = self._local.get(email)
+        if entry is not None:
+            expires_at, snapshot = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(email)
+                return snapshot
+            del self._local[email]
+
+        async with redis_manager.session() as redis:
+            raw = await redis.get(self._key(email))
+        if raw is None:
+            return None
+        try:
+            snapshot = UserSnapshotSchema.model_validate_json(raw)
+        except ValidationError as e:
+            log.warning(f"Invalid cached user {email}: {e}")
+            return None
+        if snapshot.v != self.SCHEMA_VERSION:
+            return None
+        self._set_local(snapshot)
+        return snapshot
+
+    async def set(self, user) -> UserSnapshotSchema:
+        snapshot = UserSnapshotSchema.model_validate(user)
+        async with redis_manager.session() as redis:
+            await redis.set(self._key(snapshot.email), snapshot.model_dump_json(), ex=self.ttl)
+        self._set_local(snapshot)
+        return snapshot
+
+    async def invalidate(self, email: str):
+        self._local.pop(email, None)
+        async with redis_manager.session() as redis:
+            await redis.delete(self._key(email))
+
+
+user_cache = UserCache(
+    ttl=config.cache_config.USER_CACHE_TTL,
+    local_ttl=config.cache_config.USER_CACHE_LOCAL_TTL,
+    local_size=config.cache_config.USER_CACHE_LOCAL_SIZE,
+)
@@ -0,0 +1,221 @@
+import contextlib
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import asyncpg
+import httpx
+import pytest
+import pytest_asyncio
+from redis.exceptions import RedisError
+from sqlalchemy import event, text
+
+# Тести працюють з окремою базою, яку створюють і мігрують з нуля; змінна має бути задана до імпорту src
+os.environ["POSTGRES_DB"] = os.environ.get("TEST_POSTGRES_DB", "alphadb_test")
+# Ліміти запитів перевіряються окремо, у тестах API вони лише заважають
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+# Окрема база Redis: фікстура очищає її перед тестами
+os.environ["REDIS_DB"] = os.environ.get("TEST_REDIS_DB", "15")
+
+from src.core import config  # noqa: E402
+from src.db.database import sessionmanager  # noqa: E402
+from src.db.redis import redis_manager  # noqa: E402
+from src.services.auth import auth_service  # noqa: E402
+from src.services.password import password_service  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Обсяг даних, на якому планувальник уже не обирає seq scan для точкових вибірок
+USERS = 2_000
+POSTS = 50_000
+TAGS = 50_000
+TAGS_PER_POST = 3
+COMMENTS_PER_POST = 2
+PASSWORD = "correct horse battery"
+
+SEED_SQL = [
+    f"""
+    INSERT INTO users (full_name, email, password, age, gender, role)
+    SELECT 'User ' || i, 'user' || i || '@example.com', 'x', 30, 'M', 'user'
+    FROM generate_series(0, {USERS - 1}) AS i
+    """,
+    f"""
+    INSERT INTO posts (user_id, title, description, image_url, created_at, updated_at)
+    SELECT u.id, 'sunset ' || i, 'photo number ' || i, 'https://example.com/' || i || '.jpg',
+           now() - i * interval '1 second', now()
+    FROM generate_series(0, {POSTS - 1}) AS i
+    JOIN users u ON u.email = 'user' || (i % {USERS}) || '@example.com'
+    """,
+    f"INSERT INTO tags (name) SELECT 'tag' || i FROM generate_series(0, {TAGS - 1}) AS i",
+    f"""
+    INSERT INTO post_tags (post_id, tag_id)
+    SELECT p.id, t.id
+    FROM (SELECT id, row_number() OVER (ORDER BY created_at DESC) AS i FROM posts) p
+    CROSS JOIN generate_series(0, {TAGS_PER_POST - 1}) AS k
+    JOIN tags t ON t.name = 'tag' || ((p.i * 7 + k * 1013) % {TAGS})
+    """,
+    f"""
+    INSERT INTO comments (user_id, post_id, message, created_at, updated_at)
+    SELECT p.user_id, p.id, 'comment ' || k, p.created_at + k * interval '1 minute', now()
+    FROM posts p CROSS JOIN generate_series(1, {COMMENTS_PER_POST}) AS k
+    """,
+    """
+    INSERT INTO post_ratings (user_id, post_id, rating)
+    SELECT p.user_id, p.id, 1 + (abs(hashtext(p.id::text)) % 5)
+    FROM posts p WHERE abs(hashtext(p.id::text)) % 2 = 0
+    """,
+    """
+    INSERT INTO transformed_images (post_id, user_id, url, transformation_key)
+    SELECT p.id, p.user_id, p.image_url || '?t=grayscale', md5(p.id::text)
+    FROM posts p
+    """,
+]
+
+
+async def _connect(db_config: config.DBConfig, database: str) -> asyncpg.Connection:
+    return await asyncpg.connect(
+        host=db_config.POSTGRES_HOST, port=db_config.POSTGRES_PORT, user=db_config.POSTGRES_USER,
+        password=str(db_config.POSTGRES_PASSWORD), database=database,
+    )
+
+
+async def _recreate_database(db_config: config.DBConfig, name: str, drop_only: bool = False):
+    try:
+        conn = await _connect(db_config, "postgres")
+    except (OSError, asyncpg.PostgresError) as err:
+        pytest.skip(f"PostgreSQL is not available: {err}")
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        if not drop_only:
+            await conn.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await conn.close()
+
+
+def alembic(*args: str, database: str | None = None) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    if database is not None:
+        env["POSTGRES_DB"] = database
+    return subprocess.run([sys.executable, "-m", "alembic", *args], cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def seeded():
+    await _recreate_database(config.db_config, config.db_config.POSTGRES_DB)
+    alembic("upgrade", "head").check_returncode()
+    async with sessionmanager.engine.begin() as conn:
+        for statement in SEED_SQL:
+            await conn.execute(text(statement))
+    async with sessionmanager.engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    async with sessionmanager.engine.connect() as conn:
+        # Зразкові ідентифікатори з середини набору даних
+        user = (await conn.execute(text(
+            "SELECT id, email FROM users WHERE email = 'user1000@example.com'"
+        ))).one()
+        post = (await conn.execute(text(
+            "SELECT id, created_at FROM posts WHERE title = 'sunset 25000'"
+        ))).one()
+        comment = (await conn.execute(text(
+            "SELECT id, created_at FROM comments WHERE post_id = :post_id ORDER BY created_at LIMIT 1"
+        ), {"post_id": post.id})).one()
+        image_id = (await conn.execute(text(
+            "SELECT id FROM transformed_images WHERE post_id = :post_id"
+        ), {"post_id": post.id})).scalar_one()
+    yield {
+        "user_id": user.id,
+        "email": user.email,
+        "post_id": post.id,
+        "post_created_at": post.created_at,
+        "comment_cursor": (comment.created_at, comment.id),
+        "image_id": image_id,
+        "tag": "tag1234",
+    }
+    await sessionmanager.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def db(seeded):
+    async with sessionmanager.session() as session:
+        yield session
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def client():
+    # ASGI-клієнт без lifespan: адміністратор і зовнішні сервіси для цих тестів не потрібні
+    from main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def scratch_db(seeded):
+    # Порожня база для перевірки окремих міграцій; повертає (назва, asyncpg-з'єднання)
+    name = f"{config.db_config.POSTGRES_DB}_scratch"
+    await _recreate_database(config.db_config, name)
+    conn = await _connect(config.db_config, name)
+    try:
+        yield name, conn
+    finally:
+        await conn.close()
+        await _recreate_database(config.db_config, name, drop_only=True)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def redis():
+    async with redis_manager.session() as client:
+        try:
+            await client.ping()
+        except (OSError, RedisError) as err:
+            pytest.skip(f"Redis is not available: {err}")
+        await client.flushdb()
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def password_hash():
+    return await password_service.hash(PASSWORD)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def account(seeded, redis, password_hash):
+    # Новий користувач на кожен тест: його сесії, оцінки й пости не перетинаються з іншими тестами
+    email = f"{uuid.uuid4().hex}@example.com"
+    async with sessionmanager.engine.begin() as conn:
+        user_id = (await conn.execute(text("""
+            INSERT INTO users (full_name, email, password, age, gender, role)
+            VALUES ('Test User', :email, :password, 30, 'M', 'user') RETURNING id
+        """), {"email": email, "password": password_hash})).scalar_one()
+    token = await auth_service.create_access_token(data={"sub": email})
+    return {"id": user_id, "email": email, "password": PASSWORD, "headers": {"Authorization": f"Bearer {token}"}}
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def own_post(account):
+    async with sessionmanager.engine.begin() as conn:
+        post_id = (await conn.execute(text("""
+            INSERT INTO posts (user_id, title, description, image_url)
+            VALUES (:user_id, 'own post', 'test', 'https://res.cloudinary.com/demo/image/upload/v1/test/own.jpg')
+            RETURNING id
+        """), {"user_id": account["id"]})).scalar_one()
+    return post_id
+
+
+@contextlib.contextmanager
+def capture_statements():
+    # Перехоплює SQL і параметри, які репозиторій надсилає драйверу
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engine = sessionmanager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select, text
+
+from src.db.database import sessionmanager
+from src.db.query_stats import track_queries
+from src.models.transformed_images import TransformedImage
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+SPECS = [
+    {"operation": "resize", "width": 64, "height": 64, "crop": "thumb"},
+    {"operation": "apply_filter", "effect": "blur", "value": 50},
+    {"operation": "reduce_size", "quality": "auto:eco", "format": "webp"},
+]
+
+
+async def test_batch_returns_the_post_by_transformation_matrix(client, account, own_post):
+    async with sessionmanager.engine.begin() as conn:
+        second_post = (await conn.execute(text("""
+            INSERT INTO posts (user_id, title, description, image_url)
+            VALUES (:user_id, 'second', 'test', 'https://res.cloudinary.com/demo/image/upload/v1/test/second.jpg')
+            RETURNING id
+        """), {"user_id": account["id"]})).scalar_one()
+    post_ids = [str(second_post), str(own_post)]
+    body = {"post_ids": post_ids + [post_ids[0]], "transformations": SPECS}
+    with track_queries() as stats:
+        response = await client.post("/api/images/batch", json=body, headers=account["headers"])
+    assert response.status_code == 201
+    items = response.json()["items"]
+    # Дубль post_id відкинуто, порядок рядків і стовпців — як у запиті
+    assert [item["post_id"] for item in items] == post_ids
+    for item in items:
+        urls = [image["url"] for image in item["images"]]
+        assert [("c_thumb" in urls[0]), ("e_blur:50" in urls[1]), ("f_webp" in urls[2])] == [True, True, True]
+        assert all(image["post_id"] == item["post_id"] for image in item["images"])
+    # Користувач із кешу, пости одним запитом, усі зображення одним upsert
+    assert stats.statements <= 3
+
+    again = await client.post("/api/images/batch", json=body, headers=account["headers"])
+    assert again.json() == response.json()
+    async with sessionmanager.session() as db:
+        count = (await db.execute(
+            select(func.count()).select_from(TransformedImage)
+            .where(TransformedImage.user_id == account["id"])
+        )).scalar_one()
+    assert count == len(post_ids) * len(SPECS)
+
+
+async def test_batch_rejects_missing_posts_and_bad_filters(client, account, own_post):
+    missing = str(uuid.uuid4())
+    response = await client.post("/api/images/batch", headers=account["headers"],
+                                 json={"post_ids": [str(own_post), missing], "transformations": SPECS})
+    assert response.status_code == 404
+    assert missing in response.json()["detail"]
+
+    response = await client.post("/api/images/batch", headers=account["headers"], json={
+        "post_ids": [str(own_post)], "transformations": [{"operation": "apply_filter", "effect": "blur", "value": 500}],
+    })
+    assert response.status_code == 400
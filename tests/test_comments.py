@@ -0,0 +1,56 @@
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from src.db.database import sessionmanager
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+COMMENTS = 25
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def thread(account, own_post):
+    # Кожен третій коментар має той самий created_at, що й попередній: порядок визначає id
+    async with sessionmanager.engine.begin() as conn:
+        rows = (await conn.execute(text("""
+            INSERT INTO comments (user_id, post_id, message, created_at)
+            SELECT :user_id, :post_id, 'comment ' || i, timestamp '2026-01-01' + (i - i % 3) * interval '1 second'
+            FROM generate_series(1, :total) AS i
+            RETURNING id, created_at
+        """), {"user_id": account["id"], "post_id": own_post, "total": COMMENTS})).all()
+    return own_post, [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id))]
+
+
+async def test_pages_walk_the_thread_in_order(client, thread):
+    post_id, expected = thread
+    found, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 10} | ({"cursor": cursor} if cursor else {})
+        response = await client.get(f"/api/comments/{post_id}/page", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        found.extend(item["id"] for item in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert found == [str(comment_id) for comment_id in expected]
+    assert pages == 3
+
+
+async def test_stream_returns_every_comment_as_ndjson(client, thread):
+    post_id, expected = thread
+    response = await client.get(f"/api/comments/{post_id}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [str(comment_id) for comment_id in expected]
+
+
+async def test_invalid_cursor_is_rejected(client, thread):
+    post_id, _ = thread
+    response = await client.get(f"/api/comments/{post_id}/page", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
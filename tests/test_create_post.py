@@ -0,0 +1,43 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from src.db.query_stats import track_queries
+from src.models.posts import PostTag, Tag
+from src.repository import posts
+from src.services.tag_suggest import tag_suggester
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def create(db, account, tags):
+    with track_queries() as stats:
+        post = await posts.create_post("tagged", "test", "https://example.com/t.jpg", account["id"], db, tags)
+    return post, stats.statements
+
+
+async def test_tags_are_upserted_in_bulk(db, account, seeded):
+    fresh = [f"fresh-{uuid.uuid4().hex[:8]}" for _ in range(3)]
+    tags = [seeded["tag"], *fresh, fresh[0]]
+    tags_before = (await db.execute(select(func.count()).select_from(Tag))).scalar_one()
+
+    post, statements = await create(db, account, tags)
+
+    names = (await db.execute(
+        select(Tag.name).join(PostTag).where(PostTag.post_id == post.id)
+    )).scalars().all()
+    assert sorted(names) == sorted({seeded["tag"], *fresh})
+    # Наявний тег перевикористано, дубль у запиті не створює другий рядок
+    assert (await db.execute(select(func.count()).select_from(Tag))).scalar_one() == tags_before + 3
+    assert fresh[1] in tag_suggester._names
+
+    # Кількість запитів не залежить від кількості тегів: зайвий лише SELECT уже наявних
+    _, single = await create(db, account, [f"fresh-{uuid.uuid4().hex[:8]}"])
+    assert statements == single + 1
+
+
+async def test_post_without_tags(db, account):
+    post, _ = await create(db, account, [])
+    count = (await db.execute(select(func.count()).select_from(PostTag).where(PostTag.post_id == post.id))).scalar_one()
+    assert count == 0
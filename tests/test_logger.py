@@ -0,0 +1,42 @@
+import io
+import logging
+import queue
+
+from src.core.logger.logger import DroppingQueueHandler, LogListener
+
+
+class ClosedStreamHandler(logging.StreamHandler):
+    def flush(self):
+        raise ValueError("I/O operation on closed file")
+
+
+def make_logger(handler: logging.Handler) -> tuple[logging.Logger, LogListener]:
+    log_queue = queue.Queue(maxsize=100)
+    listener = LogListener(log_queue, handler)
+    logger = logging.getLogger(f"test_logger_{id(handler)}")
+    logger.propagate = False
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    return logger, listener
+
+
+def test_flush_writes_queued_records_without_restarting_the_thread():
+    stream = io.StringIO()
+    logger, listener = make_logger(logging.StreamHandler(stream))
+    listener.start()
+    thread = listener._thread
+    try:
+        logger.warning("first")
+        logger.warning("second")
+        assert listener.flush(timeout=5)
+        assert stream.getvalue().splitlines() == ["first", "second"]
+        assert listener._thread is thread and thread.is_alive()
+    finally:
+        listener.stop()
+
+
+def test_stop_ignores_closed_streams():
+    logger, listener = make_logger(ClosedStreamHandler(io.StringIO()))
+    listener.start()
+    logger.warning("record")
+    listener.stop()
+    listener.flush()
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.password import PasswordService
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_hashing_does_not_block_the_event_loop():
+    service = PasswordService(workers=1, max_queue=0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        hashed = await service.hash("secret")
+        # Поки bcrypt працює в пулі, event loop обслуговує інші корутини
+        assert ticks > 5
+        assert await service.verify("secret", hashed)
+    finally:
+        task.cancel()
+        service.shutdown()
+
+
+async def test_saturated_pool_rejects_with_503():
+    service = PasswordService(workers=1, max_queue=1)
+    try:
+        running = [asyncio.create_task(service.hash("secret")) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as err:
+            await service.hash("secret")
+        assert err.value.status_code == 503
+        assert err.value.headers == {"Retry-After": "1"}
+        await asyncio.gather(*running)
+        assert service._pending == 0
+    finally:
+        service.shutdown()
+
+
+async def test_login_verifies_password_in_the_pool(client, account):
+    response = await client.post("/api/auth/login", data={"username": account["email"], "password": "wrong"})
+    assert response.status_code == 401
+    response = await client.post("/api/auth/login", data={"username": account["email"], "password": account["password"]})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
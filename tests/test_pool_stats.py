@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core import config
+from src.db.database import InstrumentedQueuePool, sessionmanager
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def make_engine():
+    return create_async_engine(
+        config.db_config.DATABASE_URL, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.2,
+    )
+
+
+async def test_only_blocked_checkouts_are_counted(seeded):
+    engine, other = make_engine(), make_engine()
+    try:
+        for _ in range(3):
+            async with engine.connect():
+                pass
+        assert engine.pool.wait_count == 0
+
+        async with engine.connect():
+            # Друге з'єднання чекає на звільнення першого і падає за таймаутом
+            with pytest.raises(PoolTimeoutError):
+                await engine.connect().start()
+        assert (engine.pool.wait_count, engine.pool.timeouts) == (1, 1)
+        assert engine.pool.max_wait_time >= 0.2
+
+        async with engine.connect():
+            waiter = asyncio.create_task(engine.connect().start())
+            await asyncio.sleep(0.05)
+        await (await waiter).close()
+        assert (engine.pool.wait_count, engine.pool.timeouts) == (2, 1)
+
+        # Лічильники належать екземпляру пулу, а не класу
+        assert (other.pool.wait_count, other.pool.timeouts) == (0, 0)
+    finally:
+        await engine.dispose()
+        await other.dispose()
+
+
+async def test_pool_stats_reports_configured_overflow(seeded):
+    stats = sessionmanager.pool_stats()
+    assert stats["max_overflow"] == config.db_config.DB_MAX_OVERFLOW
+    assert stats["wait_count"] == sessionmanager.engine.pool.wait_count
@@ -0,0 +1,37 @@
+import pytest
+from redis.asyncio import Redis
+
+from src.db.redis import redis_manager
+from src.services.post_cache import PostCache
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    # Порт, на якому гарантовано ніхто не слухає
+    client = Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+    monkeypatch.setattr(redis_manager, "_redis_client", client)
+    return client
+
+
+async def test_read_through_falls_back_to_loader_when_redis_is_down(redis_down):
+    cache = PostCache(ttl=60, lock_ttl_ms=1000, lock_wait=0.1)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return b"payload"
+
+    assert await cache.get_or_load("post:v1:test", loader) == b"payload"
+    assert calls == [1]
+
+
+async def test_loader_errors_still_propagate_when_redis_is_down(redis_down):
+    cache = PostCache(ttl=60, lock_ttl_ms=1000, lock_wait=0.1)
+
+    async def loader():
+        raise LookupError("boom")
+
+    with pytest.raises(LookupError):
+        await cache.get_or_load("post:v1:test", loader)
@@ -0,0 +1,49 @@
+import pytest
+
+from src.services.qr_code import BORDER, QrCodeService, QrCodeTooSmall
+
+URL = "https://example.com/posts/0b5d7e2f-9a14-4c7e-8f41-0a2b3c4d5e6f"
+
+
+@pytest.fixture
+def service():
+    return QrCodeService(local_size=8, redis_ttl=60, use_redis=False)
+
+
+@pytest.mark.parametrize("size", [None, 100, 200, 513])
+def test_every_module_maps_to_whole_pixels(service, size):
+    qr = service._matrix(URL, "H")
+    modules = qr.modules_count + 2 * BORDER
+    size = size or modules  # None — мінімально допустимий розмір
+    img = service.generatePilImage(URL, size, "H")
+    assert img.size == (size, size)
+
+    box = size // modules
+    assert box >= 1
+    offset = (size - box * modules) // 2
+    # Центр кожного модуля має колір цього модуля: код читається без втрат
+    for row, line in enumerate(qr.modules):
+        for col, dark in enumerate(line):
+            x = offset + (col + BORDER) * box + box // 2
+            y = offset + (row + BORDER) * box + box // 2
+            assert (img.getpixel((x, y)) == (0, 0, 0)) == dark
+
+
+def test_size_below_module_count_is_rejected(service):
+    modules = service._matrix(URL, "H").modules_count + 2 * BORDER
+    with pytest.raises(QrCodeTooSmall) as err:
+        service.generatePilImage(URL, modules - 1, "H")
+    assert err.value.minimum == modules
+    with pytest.raises(QrCodeTooSmall):
+        service.generateSvg(URL, modules - 1, "H")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("path", ["/api/qr_code/generate_image", "/api/qr_code/generate_svg"])
+async def test_api_returns_400_for_unreadable_size(client, path):
+    response = await client.post(path, params={"url": URL, "size": 21})
+    assert response.status_code == 400
+    assert "at least" in response.json()["detail"]
+
+    response = await client.post(path, params={"url": URL, "size": 200})
+    assert response.status_code == 200
@@ -0,0 +1,57 @@
+import pytest
+
+from src.db.query_stats import track_queries
+from src.repository import posts, transformed_images, user
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_get_user_by_email_does_not_join_posts(db, seeded):
+    with track_queries() as stats:
+        found = await user.get_user_by_email(seeded["email"], db)
+    assert found.email == seeded["email"]
+    assert stats.statements == 1
+    assert stats.rows == 1
+
+
+async def test_get_all_users_is_one_statement(db, seeded):
+    with track_queries() as stats:
+        users = await user.get_all_users_from_db(db)
+    assert len(users) > 1
+    assert stats.statements == 1
+    # Один рядок на користувача, без рядків join-у з постами
+    assert stats.rows == len(users)
+
+
+async def test_transformed_images_for_user_are_not_joined(db, seeded):
+    with track_queries() as stats:
+        images = await transformed_images.get_all_for_user(seeded["user_id"], db)
+    assert images
+    assert stats.statements == 1
+    assert stats.rows == len(images)
+
+
+async def test_transformed_image_by_id(db, seeded):
+    with track_queries() as stats:
+        image = await transformed_images.get(seeded["image_id"], db)
+    assert image.id == seeded["image_id"]
+    assert stats.statements == 1
+
+
+async def test_post_list_loads_tags_without_n_plus_one(db, seeded):
+    # Пости, post_tags і теги — три запити незалежно від розміру сторінки
+    for limit in (5, 50):
+        with track_queries() as stats:
+            page = await posts.get_posts(limit, 0, db)
+            tag_names = [post_tag.tag.name for post in page for post_tag in post.tags]
+        assert len(page) == limit
+        assert tag_names
+        assert stats.statements == 3
+
+
+async def test_post_detail_is_one_statement(db, seeded):
+    with track_queries() as stats:
+        post = await posts.get_post(seeded["post_id"], db)
+        tag_names = [post_tag.tag.name for post_tag in post.tags]
+    assert tag_names
+    assert stats.statements == 1
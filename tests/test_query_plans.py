@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from src.repository import comments, posts, ratings, tags, transformed_images, user
+from tests.conftest import capture_statements
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def _drain(iterator):
+    return [item async for item in iterator]
+
+
+# Точкові та сторінкові вибірки. get_all_users_from_db і get_popular_tag_names
+# читають таблицю цілком за призначенням, тому тут їх немає
+LOOKUPS = {
+    "get_user_by_email": lambda db, s: user.get_user_by_email(s["email"], db),
+    "get_user_by_id": lambda db, s: user.get_user_by_id(s["user_id"], db),
+    "get_posts": lambda db, s: posts.get_posts(10, 0, db),
+    "get_posts_after": lambda db, s: posts.get_posts_after(10, (s["post_created_at"], s["post_id"]), db),
+    "search_posts": lambda db, s: posts.search_posts("sunset 25000", 10, None, db),
+    "get_post": lambda db, s: posts.get_post(s["post_id"], db),
+    "get_post_image_urls": lambda db, s: posts.get_post_image_urls([s["post_id"]], db),
+    "get_posts_by_tag": lambda db, s: posts.get_posts_by_tag(s["tag"], db),
+    "count_user_photos": lambda db, s: posts.count_user_photos(s["user_id"], db),
+    "get_tag_by_name": lambda db, s: tags.get_tag_by_name(s["tag"], db),
+    "get_tags_for_post": lambda db, s: tags.get_tags_for_post(s["post_id"], db),
+    "get_tag_names_for_post": lambda db, s: tags.get_tag_names_for_post(s["post_id"], db),
+    "suggest_tags": lambda db, s: tags.suggest_tags("tag123", 10, db),
+    "get_comments": lambda db, s: comments.get_comments(s["post_id"], db),
+    "get_comments_after": lambda db, s: comments.get_comments_after(s["post_id"], 10, s["comment_cursor"], db),
+    "stream_comments": lambda db, s: _drain(comments.stream_comments(s["post_id"], db)),
+    "get_rating_summary": lambda db, s: ratings.get_rating_summary(s["post_id"], db),
+    "get_top_rated": lambda db, s: ratings.get_top_rated(10, db),
+    "get_all_for_user": lambda db, s: transformed_images.get_all_for_user(s["user_id"], db),
+    "get_transformed_image": lambda db, s: transformed_images.get(s["image_id"], db),
+}
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _explain(db, statement, parameters):
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar_one()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+@pytest.mark.parametrize("name", LOOKUPS)
+async def test_repository_lookup_uses_indexes(name, db, seeded):
+    with capture_statements() as captured:
+        await LOOKUPS[name](db, seeded)
+    assert captured, f"{name} issued no SQL"
+
+    for statement, parameters in captured:
+        plan = (await _explain(db, statement, parameters))[0]["Plan"]
+        seq_scans = [node["Relation Name"] for node in _plan_nodes(plan) if node["Node Type"] == "Seq Scan"]
+        assert not seq_scans, f"{name}: sequential scan on {seq_scans}\n{statement}"
@@ -0,0 +1,74 @@
+import uuid
+
+import pytest
+from redis.asyncio import Redis
+from starlette.requests import Request
+
+from src.db.redis import redis_manager
+from src.services.rate_limit import Policy, RateLimiterService, rate_limiter
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def limiter(spec: str, lease: int = 1, trust_forwarded: bool = False) -> RateLimiterService:
+    return RateLimiterService({"test": spec}, lease=lease, local_size=100, trust_forwarded=trust_forwarded, enabled=True)
+
+
+def key() -> str:
+    return f"rl:v1:test:{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def redis_calls(redis, monkeypatch):
+    calls = []
+    evaluate = redis.eval
+
+    async def counting_eval(*args, **kwargs):
+        calls.append(args[2])
+        return await evaluate(*args, **kwargs)
+
+    monkeypatch.setattr(redis, "eval", counting_eval)
+    return calls
+
+
+async def test_requests_over_the_limit_get_retry_after(redis_calls):
+    service, client = limiter("3/60"), key()
+    assert [await service.check("test", client) for _ in range(3)] == [None, None, None]
+    retry_after = await service.check("test", client)
+    # Наступний запит стане можливим через один інтервал (20 с)
+    assert 19 < retry_after <= 20
+    assert await service.check("test", key()) is None
+
+
+async def test_local_lease_saves_redis_round_trips(redis_calls):
+    service, client = limiter("10/60", lease=5), key()
+    decisions = [await service.check("test", client) for _ in range(11)]
+    assert decisions[:10] == [None] * 10
+    assert decisions[10] is not None
+    # Дві оренди по 5 запитів і одна відмова
+    assert len(redis_calls) == 3
+
+
+async def test_unavailable_redis_lets_requests_through(monkeypatch):
+    monkeypatch.setattr(redis_manager, "_redis_client", Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1))
+    service = limiter("1/60")
+    assert [await service.check("test", key()) for _ in range(3)] == [None, None, None]
+
+
+async def test_forwarded_for_is_trusted_only_when_configured():
+    request = Request({
+        "type": "http", "headers": [(b"x-forwarded-for", b"203.0.113.7, 10.0.0.1")], "client": ("10.0.0.1", 1234),
+    })
+    assert limiter("1/60").identity(request) == "ip:10.0.0.1"
+    assert limiter("1/60", trust_forwarded=True).identity(request) == "ip:203.0.113.7"
+
+
+async def test_route_returns_429_per_user(client, account, redis, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setitem(rate_limiter.policies, "posts:read", Policy.parse("posts:read", "2/60"))
+    statuses = [(await client.get("/api/posts/feed", headers=account["headers"])).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    response = await client.get("/api/posts/feed", headers=account["headers"])
+    assert int(response.headers["Retry-After"]) >= 1
+    # Ліміт рахується за користувачем, а не за спільною IP-адресою
+    assert (await client.get("/api/posts/feed")).status_code == 200
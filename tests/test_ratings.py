@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.db.database import sessionmanager
+from src.repository import ratings
+from src.services.auth import auth_service
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def aggregates(post_id) -> tuple:
+    # Збережені агрегати поряд з тими, що рахуються з post_ratings
+    async with sessionmanager.engine.connect() as conn:
+        return (await conn.execute(text("""
+            SELECT p.rating_count, p.rating_sum, p.rating_avg::float8, count(r.id), coalesce(sum(r.rating), 0)::int
+            FROM posts p LEFT JOIN post_ratings r ON r.post_id = p.id
+            WHERE p.id = :post_id GROUP BY p.id
+        """), {"post_id": post_id})).one()
+
+
+async def test_rating_is_upserted_and_aggregates_follow(client, account, own_post, seeded):
+    other = {"Authorization": f"Bearer {await auth_service.create_access_token(data={'sub': seeded['email']})}"}
+    url = f"/api/ratings/{own_post}"
+
+    response = await client.put(url, params={"rating": 5}, headers=account["headers"])
+    assert response.json() == {"post_id": str(own_post), "rating_count": 1, "rating_avg": 5.0}
+    # Повторна оцінка того ж користувача замінює голос
+    response = await client.put(url, params={"rating": 2}, headers=account["headers"])
+    assert response.json()["rating_count"] == 1 and response.json()["rating_avg"] == 2.0
+    response = await client.put(url, params={"rating": 3}, headers=other)
+    assert response.json()["rating_count"] == 2 and response.json()["rating_avg"] == 2.5
+
+    assert (await client.delete(url, headers=account["headers"])).status_code == 204
+    assert (await client.delete(url, headers=account["headers"])).status_code == 404
+    response = await client.get(url)
+    assert response.json() == {"post_id": str(own_post), "rating_count": 1, "rating_avg": 3.0}
+    assert (await client.delete(url, headers=other)).status_code == 204
+    assert tuple(await aggregates(own_post)) == (0, 0, 0.0, 0, 0)
+
+
+async def test_invalid_ratings_are_rejected(client, account, own_post):
+    response = await client.put(f"/api/ratings/{own_post}", params={"rating": 6}, headers=account["headers"])
+    assert response.status_code == 422
+    response = await client.put("/api/ratings/00000000-0000-0000-0000-000000000000", params={"rating": 3},
+                                headers=account["headers"])
+    assert response.status_code == 404
+
+
+async def test_concurrent_votes_keep_aggregates_consistent(own_post):
+    async with sessionmanager.engine.connect() as conn:
+        voters = (await conn.execute(text("SELECT id FROM users ORDER BY email LIMIT 10"))).scalars().all()
+
+    async def vote(user_id, rating):
+        async with sessionmanager.session() as db:
+            await ratings.rate_post(own_post, user_id, rating, db)
+
+    async def unvote(user_id):
+        async with sessionmanager.session() as db:
+            await ratings.unrate_post(own_post, user_id, db)
+
+    # Кожен користувач голосує двічі паралельно, частина ще й знімає голос
+    await asyncio.gather(*(vote(user_id, 1 + i % 5) for i, user_id in enumerate(voters)),
+                         *(vote(user_id, 5 - i % 5) for i, user_id in enumerate(voters)))
+    await asyncio.gather(*(unvote(user_id) for user_id in voters[:3]))
+
+    count, total, avg, actual_count, actual_sum = await aggregates(own_post)
+    assert (count, total) == (actual_count, actual_sum)
+    assert count == 7
+    assert avg == pytest.approx(round(actual_sum / actual_count, 2))
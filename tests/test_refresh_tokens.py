@@ -0,0 +1,83 @@
+import pytest
+
+from src.services.auth import auth_service
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def login(client, account, device: str = "pytest") -> dict:
+    response = await client.post("/api/auth/login", headers={"User-Agent": device},
+                                 data={"username": account["email"], "password": account["password"]})
+    assert response.status_code == 200
+    tokens = response.json()
+    tokens["sid"] = (await auth_service.decode_refresh_token(tokens["refresh_token"]))["sid"]
+    return tokens
+
+
+async def refresh(client, refresh_token: str):
+    return await client.get("/api/auth/refresh_token", headers=bearer(refresh_token))
+
+
+async def session_ids(client, access_token: str) -> list[str]:
+    response = await client.get("/api/auth/sessions", headers=bearer(access_token))
+    return [session["session_id"] for session in response.json()]
+
+
+async def test_refresh_rotates_within_the_session(client, account):
+    tokens = await login(client, account)
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert (await auth_service.decode_refresh_token(rotated["refresh_token"]))["sid"] == tokens["sid"]
+    assert (await refresh(client, rotated["refresh_token"])).status_code == 200
+    assert await session_ids(client, tokens["access_token"]) == [tokens["sid"]]
+
+
+async def test_reused_refresh_token_revokes_the_whole_session(client, account):
+    tokens = await login(client, account)
+    other = await login(client, account, device="other device")
+    rotated = (await refresh(client, tokens["refresh_token"])).json()
+
+    # Старий токен пред'явлено вдруге: вважаємо його викраденим
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Refresh token reuse detected"
+    # Відкликано все сімейство, зокрема й легітимно ротований токен
+    assert (await refresh(client, rotated["refresh_token"])).status_code == 401
+    # Інші сесії користувача не зачеплено
+    assert await session_ids(client, other["access_token"]) == [other["sid"]]
+    assert (await refresh(client, other["refresh_token"])).status_code == 200
+
+
+async def test_logout_and_session_revocation(client, account):
+    first = await login(client, account, device="first")
+    second = await login(client, account, device="second")
+    assert sorted(await session_ids(client, first["access_token"])) == sorted([first["sid"], second["sid"]])
+
+    assert (await client.post("/api/auth/logout", headers=bearer(first["access_token"]))).status_code == 204
+    assert (await refresh(client, first["refresh_token"])).status_code == 401
+
+    response = await client.delete(f"/api/auth/sessions/{second['sid']}", headers=bearer(second["access_token"]))
+    assert response.status_code == 204
+    assert (await refresh(client, second["refresh_token"])).status_code == 401
+    assert await session_ids(client, second["access_token"]) == []
+
+
+async def test_foreign_session_cannot_be_revoked(client, account, seeded):
+    tokens = await login(client, account)
+    stranger = bearer(await auth_service.create_access_token(data={"sub": seeded["email"]}))
+    response = await client.delete(f"/api/auth/sessions/{tokens['sid']}", headers=stranger)
+    assert response.status_code == 404
+    assert (await refresh(client, tokens["refresh_token"])).status_code == 200
+
+
+async def test_refresh_token_without_session_is_rejected(client, account):
+    legacy = await auth_service.create_refresh_token(data={"sub": account["email"]})
+    assert (await refresh(client, legacy)).status_code == 401
+    access = await auth_service.create_access_token(data={"sub": account["email"]})
+    assert (await refresh(client, access)).status_code == 401
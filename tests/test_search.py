@@ -0,0 +1,27 @@
+import pytest
+
+from src.core import config
+from src.repository import posts
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_common_term_ranks_only_newest_candidates(db, seeded, monkeypatch):
+    # 'sunset' є в кожному пості: ранжуються лише найновіші SEARCH_CANDIDATE_LIMIT збігів
+    monkeypatch.setattr(config.search_config, "SEARCH_CANDIDATE_LIMIT", 30)
+    found, after = [], None
+    while True:
+        rows, has_more = await posts.search_posts("sunset", 10, after, db)
+        found.extend(row.Post.title for row in rows)
+        if not has_more:
+            break
+        after = (rows[-1].rank, rows[-1].Post.id)
+
+    # У seed-даних 'sunset 0' — найновіший пост
+    assert sorted(found) == sorted(f"sunset {i}" for i in range(30))
+
+
+async def test_rare_term_is_found(db, seeded):
+    rows, has_more = await posts.search_posts("sunset 25000", 10, None, db)
+    assert [row.Post.id for row in rows] == [seeded["post_id"]]
+    assert not has_more
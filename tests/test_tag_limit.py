@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from src.db.database import sessionmanager
+from src.models.posts import MAX_TAGS_CONSTRAINT, Post, PostTag
+from src.repository import posts
+from tests.conftest import alembic
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+BEFORE_TAG_LIMIT = "a3c9e4f1b2d7"
+TAG_LIMIT = "c7e2d5a9f410"
+
+
+async def tag_counts(post_id) -> tuple[int, int]:
+    async with sessionmanager.session() as db:
+        stored = (await db.execute(select(Post.tag_count).where(Post.id == post_id))).scalar_one()
+        actual = (await db.execute(select(func.count()).select_from(PostTag).where(PostTag.post_id == post_id))).scalar_one()
+    return stored, actual
+
+
+async def test_api_rejects_sixth_tag(client, account, own_post):
+    def add(name):
+        return client.post("/api/tags/", params={"post_id": str(own_post), "name": name}, headers=account["headers"])
+
+    for i in range(5):
+        assert (await add(f"limit-{i}")).status_code == 201
+    response = await add("limit-5")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cannot add more than 5 tags to a post."
+
+    # Видалення тегу звільняє місце
+    response = await client.delete("/api/tags/", params={"post_id": str(own_post), "name": "limit-0"},
+                                   headers=account["headers"])
+    assert response.status_code == 204
+    assert (await add("limit-5")).status_code == 201
+    assert await tag_counts(own_post) == (5, 5)
+
+
+async def test_concurrent_inserts_cannot_exceed_limit(own_post):
+    async def add(name) -> bool:
+        async with sessionmanager.session() as db:
+            try:
+                await posts.add_tag_for_post(own_post, name, db)
+                return True
+            except IntegrityError as e:
+                assert MAX_TAGS_CONSTRAINT in str(e.orig)
+                return False
+
+    prefix = uuid.uuid4().hex[:8]
+    results = await asyncio.gather(*(add(f"race-{prefix}-{i}") for i in range(8)))
+    assert results.count(True) == 5
+    assert await tag_counts(own_post) == (5, 5)
+
+
+async def test_migration_aborts_when_posts_already_exceed_limit(scratch_db):
+    name, conn = scratch_db
+    alembic("upgrade", BEFORE_TAG_LIMIT, database=name).check_returncode()
+    await conn.execute("""
+        INSERT INTO users (full_name, email, password, age, gender, role) VALUES ('u', 'u@example.com', 'x', 30, 'M', 'user');
+        INSERT INTO posts (user_id, title, description, image_url) SELECT id, 'p', 'd', 'https://example.com/p.jpg' FROM users;
+        INSERT INTO tags (name) SELECT 'over-' || i FROM generate_series(1, 6) AS i;
+        INSERT INTO post_tags (post_id, tag_id) SELECT p.id, t.id FROM posts p CROSS JOIN tags t;
+    """)
+
+    result = alembic("upgrade", TAG_LIMIT, database=name)
+    assert result.returncode != 0
+    assert "1 posts have more than 5 tags" in result.stderr
+    assert "(6 tags)" in result.stderr
+    # Міграція відкотилась цілком: колонки ще немає
+    assert await conn.fetchval(
+        "SELECT count(*) FROM information_schema.columns WHERE table_name = 'posts' AND column_name = 'tag_count'"
+    ) == 0
+
+    await conn.execute("DELETE FROM post_tags WHERE tag_id = (SELECT id FROM tags WHERE name = 'over-6')")
+    alembic("upgrade", TAG_LIMIT, database=name).check_returncode()
+    assert await conn.fetchval("SELECT tag_count FROM posts") == 5
@@ -0,0 +1,36 @@
+import pytest
+
+from src.repository import tags as repository_tags
+from src.services.tag_suggest import TagSuggester
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def load(monkeypatch, suggester: TagSuggester, names: list[str]):
+    async def get_popular_tag_names(limit, db):
+        return names[:limit]
+
+    monkeypatch.setattr(repository_tags, "get_popular_tag_names", get_popular_tag_names)
+    await suggester.ensure_loaded(db=None)
+
+
+async def test_added_tags_evict_least_popular_beyond_capacity(monkeypatch):
+    suggester = TagSuggester(capacity=3, refresh_interval=300)
+    # Від найпопулярнішого до найменш популярного
+    await load(monkeypatch, suggester, ["cat", "car", "cab"])
+    assert suggester.suggest("ca", 10) == ["cab", "car", "cat"]
+
+    for name in ["cap", "cam", "can", "cow"]:
+        suggester.add(name)
+    assert len(suggester._keys) == len(suggester._names) == 3
+    assert suggester.suggest("c", 3) == ["cam", "can", "cow"]
+    # Після витіснення локальний індекс неповний: короткий результат віддається БД
+    assert suggester.suggest("cat", 10) is None
+
+
+async def test_add_keeps_complete_index_below_capacity(monkeypatch):
+    suggester = TagSuggester(capacity=10, refresh_interval=300)
+    await load(monkeypatch, suggester, ["dog"])
+    suggester.add("Dot")
+    suggester.add("dog")
+    assert suggester.suggest("do", 10) == ["dog", "Dot"]
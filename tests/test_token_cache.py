@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from src.services import auth as auth_module
+from src.services.auth import auth_service
+from src.services.token_cache import TokenCache, token_cache
+
+
+def claims(email: str, ttl: float = 60) -> dict:
+    return {"sub": email, "exp": time.time() + ttl, "scope": "access_token"}
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    decode = auth_module.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_module.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_cache_is_bounded_and_drops_expired_claims():
+    cache = TokenCache(size=2)
+    cache.set("a", claims("a@example.com"))
+    cache.set("b", claims("b@example.com"))
+    cache.get("a")
+    cache.set("c", claims("c@example.com"))
+    # Витісняється найдавніше використаний токен
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+    cache = TokenCache(size=2)
+    cache.set("old", claims("a@example.com", ttl=-1))
+    assert cache.get("old") is None
+    # Прострочений запис прибрано і з індексу користувача
+    assert not cache._entries and not cache._by_email
+
+
+def test_evict_user_drops_only_their_tokens():
+    cache = TokenCache(size=10)
+    cache.set("a1", claims("a@example.com"))
+    cache.set("a2", claims("a@example.com"))
+    cache.set("b1", claims("b@example.com"))
+    cache.evict_user("a@example.com")
+    assert cache.get("a1") is None and cache.get("a2") is None
+    assert cache.get("b1")["sub"] == "b@example.com"
+    assert "a@example.com" not in cache._by_email
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_repeated_token_is_decoded_once(decode_calls):
+    token = await auth_service.create_access_token(data={"sub": "cached@example.com"})
+    for _ in range(3):
+        assert auth_service.get_access_claims(token)["sub"] == "cached@example.com"
+    assert decode_calls == [token]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_only_valid_access_tokens_are_cached(decode_calls):
+    refresh = await auth_service.create_refresh_token(data={"sub": "cached@example.com", "sid": "s", "jti": "j"})
+    assert auth_service.get_access_claims(refresh) is None
+    assert auth_service.get_access_claims(refresh + "x") is None
+    assert token_cache.get(refresh) is None
+    # Відхилені токени щоразу перевіряються заново
+    assert auth_service.get_access_claims(refresh) is None
+    assert len(decode_calls) == 3
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_logout_evicts_cached_tokens(client, account):
+    response = await client.post("/api/auth/login", data={"username": account["email"], "password": account["password"]})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert (await client.get("/api/auth/sessions", headers=headers)).status_code == 200
+    assert account["email"] in token_cache._by_email
+
+    assert (await client.post("/api/auth/logout", headers=headers)).status_code == 204
+    assert account["email"] not in token_cache._by_email
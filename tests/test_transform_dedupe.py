@@ -0,0 +1,82 @@
+import asyncio
+import importlib.util
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from src.db.database import sessionmanager
+from src.models.transformed_images import TransformedImage
+from src.repository import transformed_images
+from src.services.transform import transformation_key
+
+MIGRATION = Path(__file__).resolve().parents[1] / "migrations/versions/8e2c4b7a1d90_add_transformed_images_transformation_key.py"
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("transformation_key_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def rows_for(post_id) -> int:
+    async with sessionmanager.session() as db:
+        return (await db.execute(
+            select(func.count()).select_from(TransformedImage).where(TransformedImage.post_id == post_id)
+        )).scalar_one()
+
+
+def test_key_ignores_parameter_order():
+    post_id = uuid.uuid4()
+    assert transformation_key(post_id, "resize", {"width": 1, "height": 2, "crop": "fill"}) == \
+        transformation_key(post_id, "resize", {"crop": "fill", "height": 2, "width": 1})
+    assert transformation_key(post_id, "resize", {"width": 1, "height": 2, "crop": "fill"}) != \
+        transformation_key(uuid.uuid4(), "resize", {"width": 1, "height": 2, "crop": "fill"})
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_repeated_transform_returns_the_same_row(client, account, own_post):
+    params = {"post_id": str(own_post), "width": 120, "height": 80, "crop": "fill"}
+    first = await client.post("/api/images/resize", params=params, headers=account["headers"])
+    second = await client.post("/api/images/resize", params=params, headers=account["headers"])
+    assert first.status_code == second.status_code == 201
+    # Той самий рядок: збігається навіть created_at
+    assert first.json() == second.json()
+    assert await rows_for(own_post) == 1
+
+    other = await client.post("/api/images/resize", params=params | {"width": 121}, headers=account["headers"])
+    assert other.json()["url"] != first.json()["url"]
+    assert await rows_for(own_post) == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_upserts_create_one_row_per_key(account, own_post):
+    keys = [transformation_key(own_post, "resize", {"width": width, "height": 10, "crop": "fit"}) for width in range(5)]
+    entries = [(own_post, key, f"https://example.com/{key}.jpg") for key in keys]
+
+    async def upsert(chunk):
+        async with sessionmanager.session() as db:
+            images = await transformed_images.upsert_many(account["id"], chunk, db)
+        return {key: image.id for key, image in images.items()}
+
+    # Перекривні набори ключів у різному порядку з восьми паралельних сесій
+    results = await asyncio.gather(*(upsert(entries[i % 3:] + entries[:i % 3]) for i in range(8)))
+    assert await rows_for(own_post) == len(keys)
+    for result in results[1:]:
+        assert {key: result[key] for key in result} == {key: results[0][key] for key in result}
+
+
+def test_migration_recomputes_legacy_keys_with_the_service_function():
+    migration = load_migration()
+    post_id = uuid.uuid4()
+    base = "http://res.cloudinary.com/demo/image/upload"
+    assert migration.legacy_key(post_id, f"{base}/c_fill,h_100,w_200/v1/folder/abc") == \
+        transformation_key(post_id, "resize", {"width": 200, "height": 100, "crop": "fill"})
+    assert migration.legacy_key(post_id, f"{base}/e_brightness:-20/v1/folder/abc") == \
+        transformation_key(post_id, "apply_filter", {"effect": "brightness", "value": -20})
+    assert migration.legacy_key(post_id, f"{base}/f_webp,q_auto:good/v1/folder/abc") == \
+        transformation_key(post_id, "reduce_size", {"quality": "auto:good", "format": "webp"})
+    # Параметри похідних локального бекенду не відновити
+    assert migration.legacy_key(post_id, "http://localhost:8000/media/derivatives/ab/abcdef.png") is None